@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from django.conf import settings
 from django.db.models import Avg, Count, Q
 from django.db.models.functions import TruncDate, TruncWeek
@@ -22,7 +24,7 @@ class RouteAnalyticsService:
         5: RouteHistory.PREFERENCE_MICROBUS_ONLY,
         6: RouteHistory.PREFERENCE_METRO_ONLY,
     }
-    ALLOWED_PREFERENCES = set(FILTER_ENUM_TO_PREFERENCE.values())
+    ALLOWED_PREFERENCES = frozenset(FILTER_ENUM_TO_PREFERENCE.values())
     DEFAULT_METRICS = [
         "requests",
         "success_rate_percent",
@@ -30,47 +32,47 @@ class RouteAnalyticsService:
         "avg_duration_seconds",
         "avg_distance_meters",
     ]
-    ALLOWED_METRICS = {
-        "requests",
-        "success_count",
-        "failed_count",
-        "success_rate_percent",
-        "avg_total_latency_ms",
-        "avg_ai_latency_ms",
-        "avg_routing_latency_ms",
-        "avg_duration_seconds",
-        "avg_distance_meters",
-        "avg_fare",
-        "unresolved_count",
-        "unresolved_rate_percent",
-        "long_walk_count",
-        "long_walk_rate_percent",
-    }
+    ALLOWED_METRICS = frozenset(
+        {
+            "requests",
+            "success_count",
+            "failed_count",
+            "success_rate_percent",
+            "avg_total_latency_ms",
+            "avg_ai_latency_ms",
+            "avg_routing_latency_ms",
+            "avg_duration_seconds",
+            "avg_distance_meters",
+            "avg_fare",
+            "unresolved_count",
+            "unresolved_rate_percent",
+            "long_walk_count",
+            "long_walk_rate_percent",
+        }
+    )
     DEFAULT_GROUP_BY = ["day"]
-    ALLOWED_GROUP_BY = {
-        "day",
-        "week",
-        "source",
-        "status",
-        "filter",
-        "selected_route_type",
-    }
+    ALLOWED_GROUP_BY = frozenset(
+        {
+            "day",
+            "week",
+            "source",
+            "status",
+            "filter",
+            "selected_route_type",
+        }
+    )
     METRIC_ANNOTATIONS = {
-        "requests": lambda: Count("id"),
-        "success_count": lambda: Count(
-            "id", filter=Q(status=RouteHistory.STATUS_SUCCESS)
-        ),
-        "failed_count": lambda: Count(
-            "id", filter=Q(status=RouteHistory.STATUS_FAILED)
-        ),
-        "avg_total_latency_ms": lambda: Avg("total_latency_ms"),
-        "avg_ai_latency_ms": lambda: Avg("ai_latency_ms"),
-        "avg_routing_latency_ms": lambda: Avg("routing_latency_ms"),
-        "avg_duration_seconds": lambda: Avg("total_duration_seconds"),
-        "avg_distance_meters": lambda: Avg("total_distance_meters"),
-        "avg_fare": lambda: Avg("estimated_fare"),
-        "unresolved_count": lambda: Count("id", filter=Q(has_result=False)),
-        "long_walk_count": lambda: Count(
+        "requests": Count("id"),
+        "success_count": Count("id", filter=Q(status=RouteHistory.STATUS_SUCCESS)),
+        "failed_count": Count("id", filter=Q(status=RouteHistory.STATUS_FAILED)),
+        "avg_total_latency_ms": Avg("total_latency_ms"),
+        "avg_ai_latency_ms": Avg("ai_latency_ms"),
+        "avg_routing_latency_ms": Avg("routing_latency_ms"),
+        "avg_duration_seconds": Avg("total_duration_seconds"),
+        "avg_distance_meters": Avg("total_distance_meters"),
+        "avg_fare": Avg("estimated_fare"),
+        "unresolved_count": Count("id", filter=Q(has_result=False)),
+        "long_walk_count": Count(
             "id",
             filter=Q(
                 walk_distance_meters__isnull=False,
@@ -78,6 +80,10 @@ class RouteAnalyticsService:
             ),
         ),
     }
+    GROUP_ANNOTATIONS = {
+        "day": TruncDate("created_at"),
+        "week": TruncWeek("created_at"),
+    }
     DERIVED_METRICS = {
         "success_rate_percent",
         "unresolved_rate_percent",
@@ -97,31 +103,26 @@ class RouteAnalyticsService:
         if raw_value in (None, ""):
             return []
 
-        parsed = []
-        for token in str(raw_value).split(","):
-            normalized = token.strip().lower()
-            if normalized and normalized in allowed_values and normalized not in parsed:
-                parsed.append(normalized)
-        return parsed
+        tokens = (token.strip() for token in str(raw_value).lower().split(","))
+        return list(dict.fromkeys(token for token in tokens if token in allowed_values))
 
     @staticmethod
     def _parse_csv_values_with_invalid(raw_value, allowed_values):
         if raw_value in (None, ""):
             return [], []
 
-        parsed = []
-        invalid = []
-        for token in str(raw_value).split(","):
-            normalized = token.strip().lower()
+        parsed = {}
+        invalid = {}
+        for token in str(raw_value).lower().split(","):
+            normalized = token.strip()
             if not normalized:
                 continue
             if normalized in allowed_values:
-                if normalized not in parsed:
-                    parsed.append(normalized)
-            elif normalized not in invalid:
-                invalid.append(normalized)
+                parsed[normalized] = None
+            else:
+                invalid[normalized] = None
 
-        return parsed, invalid
+        return list(parsed), list(invalid)
 
     @staticmethod
     def parse_metrics(raw_metrics):
@@ -259,21 +260,21 @@ class RouteAnalyticsService:
         if "long_walk_rate_percent" in selected:
             selected.update({"requests", "long_walk_count"})
 
-        annotations = {}
-        for metric in selected:
-            builder = RouteAnalyticsService.METRIC_ANNOTATIONS.get(metric)
-            if builder:
-                annotations[metric] = builder()
-        return annotations
+        metric_annotations = RouteAnalyticsService.METRIC_ANNOTATIONS
+        return {
+            metric: metric_annotations[metric]
+            for metric in selected
+            if metric in metric_annotations
+        }
 
     @staticmethod
     def _group_annotations(group_by):
-        annotations = {}
-        if "day" in group_by:
-            annotations["day"] = TruncDate("created_at")
-        if "week" in group_by:
-            annotations["week"] = TruncWeek("created_at")
-        return annotations
+        group_annotations = RouteAnalyticsService.GROUP_ANNOTATIONS
+        return {
+            field: group_annotations[field]
+            for field in group_by
+            if field in group_annotations
+        }
 
     @staticmethod
     def _safe_percent(numerator, denominator):
@@ -325,7 +326,7 @@ class RouteAnalyticsService:
             if group_annotations:
                 grouped = grouped.annotate(**group_annotations)
             grouped = grouped.values(*value_keys).annotate(**metric_annotations)
-            rows = list(grouped)
+            rows = list(grouped.iterator(chunk_size=500))
         else:
             rows = [queryset.aggregate(**metric_annotations)]
 
@@ -410,12 +411,23 @@ class RouteAnalyticsService:
 
     @staticmethod
     def serialize_applied_filters(query_params):
+        return dict(
+            RouteAnalyticsService._serialize_filters_cached(
+                query_params.get("source"),
+                query_params.get("status"),
+                query_params.get("filter"),
+                query_params.get("from_date"),
+                query_params.get("to_date"),
+            )
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _serialize_filters_cached(source, status_value, raw_filter, from_date, to_date):
         return {
-            "source": query_params.get("source"),
-            "status": query_params.get("status"),
-            "filter": RouteAnalyticsService.normalize_route_filter(
-                query_params.get("filter")
-            ),
-            "from_date": query_params.get("from_date"),
-            "to_date": query_params.get("to_date"),
+            "source": source,
+            "status": status_value,
+            "filter": RouteAnalyticsService.normalize_route_filter(raw_filter),
+            "from_date": from_date,
+            "to_date": to_date,
         }
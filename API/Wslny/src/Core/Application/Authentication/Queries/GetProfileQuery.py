@@ -23,15 +23,9 @@ class GetProfileQuery(IQuery[UserProfileDto]):
 class GetProfileQueryHandler:
     def handle(self, query: GetProfileQuery) -> Result[UserProfileDto]:
         try:
-            user = User.objects.get(pk=query.user_id)
-            return Result.success(UserProfileDto(
-                email=user.email,
-                first_name=user.first_name,
-                last_name=user.last_name,
-                mobile_number=user.mobile_number,
-                gender=user.gender,
-                address=user.address,
-                role=user.role
-            ))
+            profile = User.objects.values(
+                'email', 'first_name', 'last_name', 'mobile_number', 'gender', 'address', 'role'
+            ).get(pk=query.user_id)
+            return Result.success(UserProfileDto(**profile))
         except User.DoesNotExist:
             return Result.failure(UserErrors.NotFound)
@@ -1,8 +1,13 @@
 import grpc
+import itertools
 import sys
+import threading
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from src.Infrastructure.GrpcClients.caching import TtlLruCache
+from src.Infrastructure.GrpcClients.channels import CHANNEL_OPTIONS, create_channel
+
 STUBS_DIR = Path(__file__).resolve().parent / "stubs"
 if str(STUBS_DIR) not in sys.path:
     sys.path.append(str(STUBS_DIR))
@@ -22,57 +27,115 @@ class AiGrpcClientError(Exception):
         self.details = details
 
 
-class AiGrpcClient:
-    def __init__(self, host="ai-service", port=50052, timeout_seconds=5.0):
-        options = [
-            ('grpc.keepalive_time_ms', 60000),      # Send keepalive ping every 60 seconds
-            ('grpc.keepalive_timeout_ms', 20000),   # Wait 20 seconds for ping ack
-            ('grpc.keepalive_permit_without_calls', 1), # Allow pings even when there are no active calls
-            ('grpc.http2.max_pings_without_data', 0), # Allow unlimited pings
-            ('grpc.http2.min_ping_interval_without_data_ms', 10000) # Minimum time between pings without data
-        ]
+class _PendingExtraction:
+    """
+    An ExtractRoute call that concurrent requests for the same text wait on.
+    """
+    __slots__ = ("done", "payload", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.payload = None
+        self.error = None
 
-        if str(port) == "443":
-            credentials = grpc.ssl_channel_credentials()
-            self.channel = grpc.secure_channel(f"{host}:{port}", credentials, options=options)
-        else:
-            self.channel = grpc.insecure_channel(f"{host}:{port}", options=options)
-        self.timeout_seconds = timeout_seconds
 
+class AiGrpcClient:
+    def __init__(
+        self,
+        host="ai-service",
+        port=50052,
+        timeout_seconds=5.0,
+        pool_size=1,
+        cache_size=0,
+        cache_ttl_seconds=600.0,
+        channel_options=CHANNEL_OPTIONS,
+    ):
         if interpreter_pb2_grpc is None:
             raise RuntimeError("interpreter gRPC stubs are not generated")
 
-        self.stub = interpreter_pb2_grpc.TransitInterpreterStub(self.channel)
+        self.channels = [
+            create_channel(host, port, channel_options)
+            for _ in range(max(int(pool_size), 1))
+        ]
+        self.timeout_seconds = timeout_seconds
+        # cycle.__next__ runs entirely in C, so it needs no lock across threads.
+        self._next_stub = itertools.cycle(
+            [interpreter_pb2_grpc.TransitInterpreterStub(channel) for channel in self.channels]
+        ).__next__
+        self._results = TtlLruCache(cache_size, cache_ttl_seconds)
+        self._pending = {}
+        self._pending_lock = threading.Lock()
 
     def extract_route(self, text: str) -> Optional[Dict[str, Any]]:
         if interpreter_pb2 is None:
             raise RuntimeError("interpreter gRPC stubs are not generated")
 
+        # Extraction is deterministic for the same text, so successful results
+        # are reused; errors and empty results always go back to the service.
+        cache_key = text.strip().lower()
+        cached = self._results.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        # Concurrent requests for the same text share one in-flight RPC.
+        with self._pending_lock:
+            pending = self._pending.get(cache_key)
+            is_owner = pending is None
+            if is_owner:
+                pending = self._pending[cache_key] = _PendingExtraction()
+
+        if not is_owner:
+            pending.done.wait()
+            if isinstance(pending.error, AiGrpcClientError):
+                raise AiGrpcClientError(
+                    code=pending.error.code, details=pending.error.details
+                )
+            if pending.error is not None:
+                # Unexpected failures are not shared; this request tries itself.
+                return self._request_extraction(text)
+            return None if pending.payload is None else dict(pending.payload)
+
+        try:
+            pending.payload = self._request_extraction(text)
+        except Exception as error:
+            pending.error = error
+            raise
+        finally:
+            with self._pending_lock:
+                del self._pending[cache_key]
+            pending.done.set()
+
+        if pending.payload is None:
+            return None
+        self._results.put(cache_key, pending.payload)
+        return dict(pending.payload)
+
+    def _request_extraction(self, text: str) -> Optional[Dict[str, Any]]:
         request = interpreter_pb2.RouteRequest(text=text)
         try:
-            response = self.stub.ExtractRoute(request, timeout=self.timeout_seconds)
-
-            payload: Dict[str, Any] = {
-                "from_location": response.from_location,
-                "to_location": response.to_location,
-                "intent": response.intent,
-            }
-
-            if response.HasField("from_coordinates"):
-                payload["from_lat"] = response.from_coordinates.latitude
-                payload["from_lon"] = response.from_coordinates.longitude
-
-            if response.HasField("to_coordinates"):
-                payload["to_lat"] = response.to_coordinates.latitude
-                payload["to_lon"] = response.to_coordinates.longitude
-
-            if "to_lat" not in payload or "to_lon" not in payload:
-                return None
-
-            return payload
+            response = self._next_stub().ExtractRoute(request, timeout=self.timeout_seconds)
         except grpc.RpcError as error:
             code = error.code() if hasattr(error, "code") else grpc.StatusCode.UNKNOWN
             details = "AI service call failed"
             if hasattr(error, "details") and error.details():
                 details = str(error.details())
             raise AiGrpcClientError(code=code, details=details) from error
+
+        payload: Dict[str, Any] = {
+            "from_location": response.from_location,
+            "to_location": response.to_location,
+            "intent": response.intent,
+        }
+
+        if response.HasField("from_coordinates"):
+            payload["from_lat"] = response.from_coordinates.latitude
+            payload["from_lon"] = response.from_coordinates.longitude
+
+        if response.HasField("to_coordinates"):
+            payload["to_lat"] = response.to_coordinates.latitude
+            payload["to_lon"] = response.to_coordinates.longitude
+
+        if "to_lat" not in payload or "to_lon" not in payload:
+            return None
+
+        return payload
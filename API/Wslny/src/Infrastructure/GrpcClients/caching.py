@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TtlLruCache:
+    """
+    Thread-safe LRU cache whose entries optionally expire after ttl_seconds.
+    """
+    def __init__(self, max_size, ttl_seconds=None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if self.max_size <= 0:
+            return
+        expires_at = None
+        if self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class TtlSnapshot:
+    """
+    Thread-safe single value that expires ttl_seconds after it was stored.
+    A ttl_seconds of 0 or less disables it, so get() always misses.
+    """
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._value = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._value is not None and self._expires_at <= time.monotonic():
+                self._value = None
+            return self._value
+
+    def put(self, value):
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._value = value
+            self._expires_at = time.monotonic() + self.ttl_seconds
@@ -0,0 +1,31 @@
+import grpc
+
+CHANNEL_OPTIONS = [
+    ('grpc.keepalive_time_ms', 60000),      # Send keepalive ping every 60 seconds
+    ('grpc.keepalive_timeout_ms', 20000),   # Wait 20 seconds for ping ack
+    ('grpc.keepalive_permit_without_calls', 1), # Allow pings even when there are no active calls
+    ('grpc.http2.max_pings_without_data', 0), # Allow unlimited pings
+    ('grpc.http2.min_ping_interval_without_data_ms', 10000), # Minimum time between pings without data
+    ('grpc.use_local_subchannel_pool', 1),  # Give each pooled channel its own connection
+    ('grpc.http2.bdp_probe', 1),            # Grow HTTP/2 flow-control windows to the link's bandwidth-delay product
+    ('grpc.max_receive_message_length', 16 * 1024 * 1024),  # Room for long multi-route responses
+]
+
+
+def channel_options(max_receive_message_bytes):
+    options = dict(CHANNEL_OPTIONS)
+    options['grpc.max_receive_message_length'] = max_receive_message_bytes
+    return list(options.items())
+
+
+def create_channel(host, port, options=CHANNEL_OPTIONS):
+    if str(port) == "443":
+        credentials = grpc.ssl_channel_credentials()
+        channel = grpc.secure_channel(f"{host}:{port}", credentials, options=options)
+    else:
+        channel = grpc.insecure_channel(f"{host}:{port}", options=options)
+
+    # Start connecting right away so the first call on each pooled channel
+    # does not pay for the TCP/HTTP2 handshake.
+    grpc.channel_ready_future(channel)
+    return channel
@@ -0,0 +1,68 @@
+import threading
+
+from django.conf import settings
+
+from src.Infrastructure.GrpcClients.ai_client import AiGrpcClient
+from src.Infrastructure.GrpcClients.channels import channel_options
+from src.Infrastructure.GrpcClients.routing_client import RoutingGrpcClient
+
+_clients_lock = threading.Lock()
+_ai_client = None
+_routing_client = None
+# A client that fails to boot (e.g. missing stubs) fails the same way for the
+# rest of the process, so the error is kept instead of retrying per request.
+_boot_errors = {}
+
+
+def _boot_client(name, factory):
+    if name in _boot_errors:
+        raise RuntimeError(_boot_errors[name])
+    try:
+        return factory()
+    except RuntimeError as error:
+        _boot_errors[name] = str(error)
+        raise
+
+
+def get_ai_client() -> AiGrpcClient:
+    global _ai_client
+    if _ai_client is None:
+        with _clients_lock:
+            if _ai_client is None:
+                _ai_client = _boot_client(
+                    "ai",
+                    lambda: AiGrpcClient(
+                        host=settings.AI_GRPC_HOST,
+                        port=settings.AI_GRPC_PORT,
+                        timeout_seconds=settings.AI_GRPC_TIMEOUT_SECONDS,
+                        pool_size=settings.GRPC_CHANNEL_POOL_SIZE,
+                        cache_size=settings.AI_EXTRACT_CACHE_SIZE,
+                        cache_ttl_seconds=settings.AI_EXTRACT_CACHE_TTL_SECONDS,
+                        channel_options=channel_options(
+                            settings.GRPC_MAX_RECEIVE_MESSAGE_BYTES
+                        ),
+                    ),
+                )
+    return _ai_client
+
+
+def get_routing_client() -> RoutingGrpcClient:
+    global _routing_client
+    if _routing_client is None:
+        with _clients_lock:
+            if _routing_client is None:
+                _routing_client = _boot_client(
+                    "routing",
+                    lambda: RoutingGrpcClient(
+                        host=settings.ROUTING_GRPC_HOST,
+                        port=settings.ROUTING_GRPC_PORT,
+                        timeout_seconds=settings.ROUTING_GRPC_TIMEOUT_SECONDS,
+                        pool_size=settings.GRPC_CHANNEL_POOL_SIZE,
+                        cache_size=settings.ROUTING_RESULT_CACHE_SIZE,
+                        cache_ttl_seconds=settings.ROUTING_RESULT_CACHE_TTL_SECONDS,
+                        channel_options=channel_options(
+                            settings.GRPC_MAX_RECEIVE_MESSAGE_BYTES
+                        ),
+                    ),
+                )
+    return _routing_client
@@ -1,8 +1,12 @@
 import grpc
+import itertools
 import sys
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from src.Infrastructure.GrpcClients.caching import TtlLruCache
+from src.Infrastructure.GrpcClients.channels import CHANNEL_OPTIONS, create_channel
+
 STUBS_DIR = Path(__file__).resolve().parent / "stubs"
 if str(STUBS_DIR) not in sys.path:
     sys.path.append(str(STUBS_DIR))
@@ -22,124 +26,215 @@ class RoutingGrpcClientError(Exception):
         self.details = details
 
 
-class RoutingGrpcClient:
-    def __init__(self, host="routing-engine", port=50051, timeout_seconds=10.0):
-        options = [
-            ('grpc.keepalive_time_ms', 60000),
-            ('grpc.keepalive_timeout_ms', 20000),
-            ('grpc.keepalive_permit_without_calls', 1),
-            ('grpc.http2.max_pings_without_data', 0),
-            ('grpc.http2.min_ping_interval_without_data_ms', 10000)
-        ]
+class _CachedRouteCall:
+    """
+    Stands in for a GetRoute future when the response is already cached.
+    """
+    __slots__ = ("_response",)
 
-        if str(port) == "443":
-            credentials = grpc.ssl_channel_credentials()
-            self.channel = grpc.secure_channel(f"{host}:{port}", credentials, options=options)
-        else:
-            self.channel = grpc.insecure_channel(f"{host}:{port}", options=options)
-        self.timeout_seconds = timeout_seconds
+    def __init__(self, response):
+        self._response = response
+
+    def result(self):
+        return self._response
 
+    def cancel(self):
+        return False
+
+    def add_done_callback(self, callback):
+        callback(self)
+
+
+class RoutingGrpcClient:
+    def __init__(
+        self,
+        host="routing-engine",
+        port=50051,
+        timeout_seconds=10.0,
+        pool_size=1,
+        channel_options=CHANNEL_OPTIONS,
+        cache_size=0,
+        cache_ttl_seconds=60.0,
+    ):
         if routing_pb2_grpc is None:
             raise RuntimeError("routing gRPC stubs are not generated")
 
-        self.stub = routing_pb2_grpc.RoutingServiceStub(self.channel)
+        self.channels = [
+            create_channel(host, port, channel_options)
+            for _ in range(max(int(pool_size), 1))
+        ]
+        self.timeout_seconds = timeout_seconds
+        # cycle.__next__ runs entirely in C, so it needs no lock across threads.
+        self._next_stub = itertools.cycle(
+            [routing_pb2_grpc.RoutingServiceStub(channel) for channel in self.channels]
+        ).__next__
+        self._responses = TtlLruCache(cache_size, cache_ttl_seconds)
 
-    def get_route(
-        self, sLat: float, sLon: float, dLat: float, dLon: float, mode: str = "optimal"
-    ) -> Optional[Dict[str, Any]]:
+    def _build_request(self, sLat, sLon, dLat, dLon, mode):
         if routing_pb2 is None:
             raise RuntimeError("routing gRPC stubs are not generated")
 
         origin = routing_pb2.Point(latitude=sLat, longitude=sLon)
         destination = routing_pb2.Point(latitude=dLat, longitude=dLon)
 
-        request = routing_pb2.RouteRequest(
+        return routing_pb2.RouteRequest(
             origin=origin, destination=destination, mode=mode
         )
 
+    def get_route(
+        self,
+        sLat: float,
+        sLon: float,
+        dLat: float,
+        dLon: float,
+        mode: str = "optimal",
+        route_type: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return a newly built result dict that the caller owns and may mutate.
+
+        When route_type is given, route options of other types are skipped
+        instead of being converted.
+        """
+        cache_key = self._cache_key(sLat, sLon, dLat, dLon, mode)
+        response = self._responses.get(cache_key)
+        if response is None:
+            request = self._build_request(sLat, sLon, dLat, dLon, mode)
+            try:
+                response = self._next_stub().GetRoute(
+                    request, timeout=self.timeout_seconds
+                )
+            except grpc.RpcError as error:
+                raise self._client_error(error) from error
+            self._responses.put(cache_key, response)
+
+        return self._to_result(response, route_type)
+
+    def start_route(
+        self, sLat: float, sLon: float, dLat: float, dLon: float, mode: str = "optimal"
+    ) -> grpc.Future:
+        """Start GetRoute without blocking; pass the returned call to finish_route."""
+        cache_key = self._cache_key(sLat, sLon, dLat, dLon, mode)
+        response = self._responses.get(cache_key)
+        if response is not None:
+            return _CachedRouteCall(response)
+
+        request = self._build_request(sLat, sLon, dLat, dLon, mode)
+        call = self._next_stub().GetRoute.future(request, timeout=self.timeout_seconds)
+        call.add_done_callback(lambda done: self._remember(cache_key, done))
+        return call
+
+    def finish_route(
+        self, call: grpc.Future, route_type: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         try:
-            response = self.stub.GetRoute(request, timeout=self.timeout_seconds)
-
-            if response.routes:
-                result = {
-                    "query": {
-                        "origin": {
-                            "lat": response.query.origin.latitude,
-                            "lon": response.query.origin.longitude,
-                        },
-                        "destination": {
-                            "lat": response.query.destination.latitude,
-                            "lon": response.query.destination.longitude,
-                        },
+            response = call.result()
+        except grpc.RpcError as error:
+            raise self._client_error(error) from error
+
+        return self._to_result(response, route_type)
+
+    @staticmethod
+    def _cache_key(sLat, sLon, dLat, dLon, mode):
+        # Five decimal places is about a metre, well inside a walking segment,
+        # so points that close share one cached route. The response protos are
+        # never mutated; every caller still gets its own dict from _to_result.
+        return (round(sLat, 5), round(sLon, 5), round(dLat, 5), round(dLon, 5), mode)
+
+    def _remember(self, cache_key, call):
+        if not call.cancelled() and call.exception() is None:
+            self._responses.put(cache_key, call.result())
+
+    @staticmethod
+    def _client_error(error):
+        code = error.code() if hasattr(error, "code") else grpc.StatusCode.UNKNOWN
+        details = "Routing service call failed"
+        if hasattr(error, "details") and error.details():
+            details = str(error.details())
+        return RoutingGrpcClientError(code=code, details=details)
+
+    @staticmethod
+    def _to_result(response, route_type=None):
+        if response.routes:
+            result = {
+                "query": {
+                    "origin": {
+                        "lat": response.query.origin.latitude,
+                        "lon": response.query.origin.longitude,
                     },
-                    "routes": [],
-                }
+                    "destination": {
+                        "lat": response.query.destination.latitude,
+                        "lon": response.query.destination.longitude,
+                    },
+                },
+                "routes": [],
+            }
 
-                for route in response.routes:
-                    route_data = {
+            for route in response.routes:
+                if route_type is not None and route.type != route_type:
+                    continue
+
+                # Options that were not found are never selected, so their
+                # segments are not worth converting.
+                segments = []
+                if route.found:
+                    segments = [
+                        {
+                            "startLocation": {
+                                "lat": segment.start_location.latitude,
+                                "lon": segment.start_location.longitude,
+                                "name": segment.start_name,
+                            },
+                            "endLocation": {
+                                "lat": segment.end_location.latitude,
+                                "lon": segment.end_location.longitude,
+                                "name": segment.end_name,
+                            },
+                            "method": segment.method,
+                            "numStops": segment.num_stops,
+                            "distanceMeters": segment.distance_meters,
+                            "durationSeconds": segment.duration_seconds,
+                        }
+                        for segment in route.segments
+                    ]
+
+                result["routes"].append(
+                    {
                         "type": route.type,
                         "found": route.found,
                         "totalDurationSeconds": route.total_duration_seconds,
                         "totalDurationFormatted": route.total_duration_formatted,
                         "totalSegments": route.total_segments,
                         "totalDistanceMeters": route.total_distance_meters,
-                        "segments": [],
-                    }
-
-                    for segment in route.segments:
-                        route_data["segments"].append(
-                            {
-                                "startLocation": {
-                                    "lat": segment.start_location.latitude,
-                                    "lon": segment.start_location.longitude,
-                                    "name": segment.start_name,
-                                },
-                                "endLocation": {
-                                    "lat": segment.end_location.latitude,
-                                    "lon": segment.end_location.longitude,
-                                    "name": segment.end_name,
-                                },
-                                "method": segment.method,
-                                "numStops": segment.num_stops,
-                                "distanceMeters": segment.distance_meters,
-                                "durationSeconds": segment.duration_seconds,
-                            }
-                        )
-
-                    result["routes"].append(route_data)
-
-                return result
-
-            result = {
-                "total_distance_meters": response.total_distance_meters,
-                "total_duration_seconds": response.total_duration_seconds,
-                "steps": [],
-            }
-
-            for step in response.steps:
-                result["steps"].append(
-                    {
-                        "instruction": step.instruction,
-                        "distance_meters": step.distance_meters,
-                        "duration_seconds": step.duration_seconds,
-                        "type": step.type,
-                        "line_name": step.line_name,
-                        "start_location": {
-                            "lat": step.start_location.latitude,
-                            "lon": step.start_location.longitude,
-                        },
-                        "end_location": {
-                            "lat": step.end_location.latitude,
-                            "lon": step.end_location.longitude,
-                        },
+                        "segments": segments,
                     }
                 )
 
             return result
 
-        except grpc.RpcError as error:
-            code = error.code() if hasattr(error, "code") else grpc.StatusCode.UNKNOWN
-            details = "Routing service call failed"
-            if hasattr(error, "details") and error.details():
-                details = str(error.details())
-            raise RoutingGrpcClientError(code=code, details=details) from error
+        result = {
+            "total_distance_meters": response.total_distance_meters,
+            "total_duration_seconds": response.total_duration_seconds,
+            "steps": [],
+        }
+
+        for step in response.steps:
+            result["steps"].append(
+                {
+                    "instruction": step.instruction,
+                    "distance_meters": step.distance_meters,
+                    "duration_seconds": step.duration_seconds,
+                    "type": step.type,
+                    "line_name": step.line_name,
+                    "start_location": {
+                        "lat": step.start_location.latitude,
+                        "lon": step.start_location.longitude,
+                    },
+                    "end_location": {
+                        "lat": step.end_location.latitude,
+                        "lon": step.end_location.longitude,
+                    },
+                }
+            )
+
+        return result
@@ -0,0 +1,29 @@
+import time
+
+
+class SpeculativeRoute:
+    """
+    Routing call started before the AI service has confirmed its endpoints.
+    """
+    def __init__(self, routing_client, coordinates):
+        self.coordinates = coordinates
+        self.started_at = time.perf_counter_ns()
+        self.finished_at = None
+        self._routing_client = routing_client
+        self._call = routing_client.start_route(*coordinates)
+        self._call.add_done_callback(self._mark_finished)
+
+    def _mark_finished(self, call):
+        self.finished_at = time.perf_counter_ns()
+
+    def matches(self, coordinates):
+        return self.coordinates == coordinates
+
+    def result(self, route_type=None):
+        return self._routing_client.finish_route(self._call, route_type)
+
+    def elapsed_ns(self):
+        return (self.finished_at or time.perf_counter_ns()) - self.started_at
+
+    def discard(self):
+        self._call.cancel()
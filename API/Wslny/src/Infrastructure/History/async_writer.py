@@ -0,0 +1,112 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from src.Infrastructure.History.models import RouteHistory
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class RouteHistoryWriter:
+    def __init__(self, batch_size=128, flush_interval_seconds=0.05, max_queue_size=10000):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue_size = max_queue_size
+        self._reset()
+
+    def _reset(self):
+        self._queue = queue.Queue(maxsize=self.max_queue_size)
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def submit(self, fields):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            RouteHistory.objects.create(**fields)
+
+    def stop(self, timeout_seconds=5.0):
+        thread = self._thread
+        if thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout_seconds)
+        except queue.Full:
+            return
+        thread.join(timeout_seconds)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                thread = threading.Thread(
+                    target=self._run,
+                    name="route-history-writer",
+                    daemon=True,
+                )
+                thread.start()
+                self._thread = thread
+                atexit.register(self.stop)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            if stopping:
+                return
+
+    @staticmethod
+    def _write(batch):
+        close_old_connections()
+        try:
+            RouteHistory.objects.bulk_create(
+                [RouteHistory(**fields) for fields in batch]
+            )
+        except Exception:
+            logger.exception("Failed to write %d route history entries", len(batch))
+
+
+route_history_writer = RouteHistoryWriter()
+# A forked worker inherits the writer but not its thread, so it starts its own.
+os.register_at_fork(after_in_child=route_history_writer._reset)
+
+
+def save_route_history(fields):
+    """Write a RouteHistory row built from fields, the model's keyword arguments."""
+    # The writer builds the instance at flush time, so the row is stamped here
+    # or the model default would date it to the flush instead of the request.
+    fields.setdefault("created_at", timezone.now())
+    if settings.ROUTE_HISTORY_ASYNC_WRITES:
+        route_history_writer.submit(fields)
+    else:
+        RouteHistory.objects.create(**fields)
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("history", "0004_expand_routehistory_preference_choices"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="routehistory",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="history_rou_user_keyset_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from django.db.models.functions import Lower
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("history", "0005_routehistory_user_keyset_index"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="routehistory",
+            index=GinIndex(
+                OpClass(Lower("destination_name"), name="gin_trgm_ops"),
+                name="history_rou_dest_trgm_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("history", "0006_routehistory_destination_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="routehistory",
+            name="created_at",
+            field=models.DateTimeField(
+                db_index=True, default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
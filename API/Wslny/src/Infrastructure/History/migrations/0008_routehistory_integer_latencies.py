@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("history", "0007_routehistory_created_at_default"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="routehistory",
+            name="ai_latency_ms",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="routehistory",
+            name="routing_latency_ms",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="routehistory",
+            name="total_latency_ms",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 
 class RouteHistory(models.Model):
@@ -68,11 +71,15 @@ class RouteHistory(models.Model):
     has_result = models.BooleanField(default=False)
     unresolved_reason = models.CharField(max_length=64, blank=True, null=True)
 
-    ai_latency_ms = models.FloatField(blank=True, null=True)
-    routing_latency_ms = models.FloatField(blank=True, null=True)
-    total_latency_ms = models.FloatField(blank=True, null=True)
+    ai_latency_ms = models.IntegerField(blank=True, null=True)
+    routing_latency_ms = models.IntegerField(blank=True, null=True)
+    total_latency_ms = models.IntegerField(blank=True, null=True)
 
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Stamped when the entry is built rather than when it is inserted, because
+    # the history writer may flush a request's row some time after it ends.
+    created_at = models.DateTimeField(
+        default=timezone.now, editable=False, db_index=True
+    )
 
     class Meta:
         ordering = ["-created_at"]
@@ -85,4 +92,16 @@ class RouteHistory(models.Model):
                 fields=["status", "created_at"],
                 name="history_rou_status_93f076_idx",
             ),
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="history_rou_user_keyset_idx",
+            ),
+            GinIndex(
+                OpClass(Lower("destination_name"), name="gin_trgm_ops"),
+                name="history_rou_dest_trgm_idx",
+            ),
         ]
+
+    @classmethod
+    def analytics_base(cls):
+        return cls._default_manager.get_queryset()
@@ -0,0 +1,29 @@
+import itertools
+import os
+
+_VARIANT_BITS = 0b10 << 62
+_COUNTER_MASK = (1 << 62) - 1
+
+_prefix = None
+_counter = None
+
+
+def _reset():
+    global _prefix, _counter
+    random_hex = os.urandom(8).hex()
+    # Random 8-4-4 head with the UUIDv4 version nibble set.
+    _prefix = f"{random_hex[:8]}-{random_hex[8:12]}-4{random_hex[13:16]}-"
+    _counter = itertools.count()
+
+
+def new_request_id():
+    """
+    Return a UUIDv4-shaped id from a per-process random prefix and a counter.
+    """
+    tail = _VARIANT_BITS | (next(_counter) & _COUNTER_MASK)
+    return f"{_prefix}{tail >> 48:04x}-{tail & 0xFFFFFFFFFFFF:012x}"
+
+
+_reset()
+# Forked workers must not share the parent's prefix and counter.
+os.register_at_fork(after_in_child=_reset)
@@ -19,6 +19,8 @@ from src.Presentation.views.admin_views import (
     UserListView,
 )
 from src.Presentation.views.orchestrator import RouteOrchestratorView
+from src.Presentation.views.orchestrator import RouteByCoordinatesView
+from src.Presentation.views.orchestrator import RouteByTextView
 from src.Presentation.views.orchestrator import RouteHistoryView
 from src.Presentation.views.orchestrator import RouteSearchView
 from src.Presentation.views.orchestrator import RouteSearchConfirmView
@@ -62,6 +64,12 @@ urlpatterns = [
         name="routes-analytics-query",
     ),
     path("api/route", RouteOrchestratorView.as_view(), name="route-orchestrator"),
+    path(
+        "api/route/by-coordinates",
+        RouteByCoordinatesView.as_view(),
+        name="route-by-coordinates",
+    ),
+    path("api/route/by-text", RouteByTextView.as_view(), name="route-by-text"),
     path("api/route/history", RouteHistoryView.as_view(), name="route-history"),
     path("api/routes/search", RouteSearchView.as_view(), name="route-search"),
     path(
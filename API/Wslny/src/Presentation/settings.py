@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "drf_spectacular",
@@ -73,6 +74,8 @@ DATABASES = {
         "PASSWORD": os.getenv("DB_PASSWORD", "postgres"),
         "HOST": os.getenv("DB_HOST", "db"),
         "PORT": os.getenv("DB_PORT", "5432"),
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -125,6 +128,15 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": (
+        "src.Presentation.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "src.Presentation.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 from datetime import timedelta
@@ -137,10 +149,23 @@ SIMPLE_JWT = {
 AI_GRPC_HOST = os.getenv("AI_GRPC_HOST", "ai-service")
 AI_GRPC_PORT = int(os.getenv("AI_GRPC_PORT", "50052"))
 AI_GRPC_TIMEOUT_SECONDS = float(os.getenv("AI_GRPC_TIMEOUT_SECONDS", "120.0"))
+AI_EXTRACT_CACHE_SIZE = int(os.getenv("AI_EXTRACT_CACHE_SIZE", "10000"))
+AI_EXTRACT_CACHE_TTL_SECONDS = float(
+    os.getenv("AI_EXTRACT_CACHE_TTL_SECONDS", "600")
+)
 
 ROUTING_GRPC_HOST = os.getenv("ROUTING_GRPC_HOST", "routing-engine")
 ROUTING_GRPC_PORT = int(os.getenv("ROUTING_GRPC_PORT", "50051"))
 ROUTING_GRPC_TIMEOUT_SECONDS = float(os.getenv("ROUTING_GRPC_TIMEOUT_SECONDS", "120.0"))
+ROUTING_RESULT_CACHE_SIZE = int(os.getenv("ROUTING_RESULT_CACHE_SIZE", "4096"))
+ROUTING_RESULT_CACHE_TTL_SECONDS = float(
+    os.getenv("ROUTING_RESULT_CACHE_TTL_SECONDS", "60")
+)
+
+GRPC_CHANNEL_POOL_SIZE = int(os.getenv("GRPC_CHANNEL_POOL_SIZE", "4"))
+GRPC_MAX_RECEIVE_MESSAGE_BYTES = int(
+    os.getenv("GRPC_MAX_RECEIVE_MESSAGE_BYTES", str(16 * 1024 * 1024))
+)
 
 ROUTE_BUS_FARE_PER_RIDE = float(os.getenv("FARE_BUS_PER_RIDE", "20"))
 ROUTE_MICROBUS_FARE_PER_RIDE = float(os.getenv("FARE_MICROBUS_PER_RIDE", "10"))
@@ -154,6 +179,15 @@ ROUTE_METRO_FARE_TIERS = [
 ROUTE_LONG_WALK_THRESHOLD_METERS = float(
     os.getenv("ROUTE_LONG_WALK_THRESHOLD_METERS", "1500")
 )
+ROUTE_HISTORY_ASYNC_WRITES = os.getenv(
+    "ROUTE_HISTORY_ASYNC_WRITES", "true"
+).strip().lower() in ("1", "true", "yes")
+ROUTE_DESTINATION_HINT_CACHE_SIZE = int(
+    os.getenv("ROUTE_DESTINATION_HINT_CACHE_SIZE", "1024")
+)
+ROUTE_RECENT_DESTINATIONS_TTL_SECONDS = float(
+    os.getenv("ROUTE_RECENT_DESTINATIONS_TTL_SECONDS", "60")
+)
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "Wslny API",
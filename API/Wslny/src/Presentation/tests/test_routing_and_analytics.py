@@ -1,12 +1,37 @@
-from django.test import SimpleTestCase
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
 
 from src.Core.Application.Admin.Services.RouteAnalyticsService import (
     RouteAnalyticsQueryValidationError,
     RouteAnalyticsService,
 )
+from src.Infrastructure.GrpcClients.caching import TtlLruCache, TtlSnapshot
+from src.Infrastructure.Identity.models import User
+from src.Infrastructure.History import async_writer
+from src.Infrastructure.History.models import RouteHistory
+from src.Presentation.renderers import ORJSONRenderer
+from src.Presentation.request_ids import new_request_id
+from src.Presentation.views import orchestrator
 from src.Presentation.views.orchestrator import (
+    RouteByCoordinatesView,
+    RouteByTextView,
+    RouteHistoryScope,
+    RouteHistoryView,
+    RouteMetadataView,
     RouteOrchestratorView,
     RouteSearchView,
+    _difflib_similarity,
+    _rapidfuzz_similarity,
+    _text_similarity,
 )
 
 
@@ -51,12 +76,31 @@ class RouteAnalyticsServiceTests(SimpleTestCase):
         )
         self.assertIn("order must be 'asc' or 'desc'", str(context.exception))
 
+    def test_serialize_applied_filters_returns_independent_copies(self):
+        params = {"source": "text", "filter": "3"}
+        first = RouteAnalyticsService.serialize_applied_filters(params)
+        first["source"] = "map"
+        second = RouteAnalyticsService.serialize_applied_filters(params)
+
+        self.assertEqual(second["source"], "text")
+        self.assertEqual(second["filter"], "cheapest")
+
 
 class RouteOrchestratorParsingTests(SimpleTestCase):
     def test_parse_filter_enum_to_preference(self):
         parsed = RouteOrchestratorView._parse_filter({"filter": 3})
         self.assertEqual(parsed, "cheapest")
 
+    def test_parse_filter_out_of_range_enum_defaults_to_optimal(self):
+        self.assertEqual(RouteOrchestratorView._parse_filter({"filter": 0}), "optimal")
+        self.assertEqual(RouteOrchestratorView._parse_filter({"filter": 9}), "optimal")
+
+    def test_parse_filter_normalizes_strings_and_rejects_unhashable_values(self):
+        parse = RouteOrchestratorView._parse_filter
+        self.assertEqual(parse({"filter": " Metro_Only "}), "metro_only")
+        self.assertEqual(parse({"preference": "2"}), "fastest")
+        self.assertEqual(parse({"filter": ["3"]}), "optimal")
+
     def test_parse_current_location_query_fallback(self):
         current = RouteOrchestratorView._parse_current_location(
             {},
@@ -67,11 +111,447 @@ class RouteOrchestratorParsingTests(SimpleTestCase):
         )
         self.assertEqual(current, (30.1, 31.2))
 
+    def test_parse_text_coordinates(self):
+        parse = RouteOrchestratorView._parse_text_coordinates
+        self.assertEqual(
+            parse("30.0444, 31.2357 ; 30.0727,31.284"),
+            (30.0444, 31.2357, 30.0727, 31.284),
+        )
+        self.assertIsNone(parse("30.0444,31.2357"))
+        self.assertIsNone(parse("95,31;30,31"))
+        self.assertIsNone(parse("from 30,31 to 30.1,31.1"))
+
+    def test_is_routable_text(self):
+        is_routable = RouteOrchestratorView._is_routable_text
+        self.assertTrue(is_routable("عايز اروح العباسيه"))
+        self.assertTrue(is_routable("Gate 7"))
+        self.assertFalse(is_routable("ab"))
+        self.assertFalse(is_routable("12345"))
+        self.assertFalse(is_routable("?!..__"))
+        self.assertFalse(is_routable("a" * 513))
+
+    def test_latencies_round_to_nearest_millisecond(self):
+        to_ms = RouteHistoryScope._to_ms
+        self.assertEqual(to_ms(499_999), 0)
+        self.assertEqual(to_ms(500_000), 1)
+        self.assertEqual(to_ms(1_499_999), 1)
+        self.assertIsNone(to_ms(None))
+
 
 class RouteSearchViewTests(SimpleTestCase):
+    def test_suggest_destination_stops_at_exact_match(self):
+        candidates = [
+            {
+                "destination_name": name,
+                "name_norm": name.lower(),
+                "destination_lat": lat,
+                "destination_lon": lon,
+            }
+            for name, lat, lon in (
+                ("Abbassia Sq", 30.0, 31.0),
+                ("Abbassia", 30.07, 31.28),
+                ("Abbasiya", 30.1, 31.3),
+            )
+        ]
+        view = RouteSearchView()
+
+        with mock.patch.object(
+            RouteSearchView, "_destination_candidates", return_value=candidates
+        ), mock.patch(
+            "src.Presentation.views.orchestrator._text_similarity", return_value=0.5
+        ) as similarity:
+            suggestion = view._suggest_destination(" Abbassia ")
+
+        self.assertEqual(
+            suggestion,
+            {"name": "Abbassia", "lat": 30.07, "lon": 31.28, "confidence": 1.0},
+        )
+        self.assertEqual(similarity.call_count, 1)
+
+    def test_suggest_destination_skips_names_that_cannot_score(self):
+        candidates = [
+            {
+                "destination_name": name,
+                "name_norm": name.lower(),
+                "destination_lat": 30.0,
+                "destination_lon": 31.0,
+            }
+            for name in ("Nasr City International Stadium Gate 7", "Ramses", "Tahrir")
+        ]
+        view = RouteSearchView()
+
+        with mock.patch.object(
+            RouteSearchView, "_destination_candidates", return_value=candidates
+        ), mock.patch(
+            "src.Presentation.views.orchestrator._text_similarity",
+            wraps=_text_similarity,
+        ) as similarity:
+            suggestion = view._suggest_destination("ramsis")
+
+        self.assertEqual(suggestion["name"], "Ramses")
+        self.assertNotIn(
+            mock.call("ramsis", "nasr city international stadium gate 7"),
+            similarity.call_args_list,
+        )
+
     def test_validate_destination_coordinates(self):
         self.assertTrue(RouteSearchView._validate_destination_coordinates(30.1, 31.2))
         self.assertFalse(RouteSearchView._validate_destination_coordinates(95.0, 31.2))
+        self.assertTrue(RouteSearchView._validate_destination_coordinates(-90.0, -180.0))
+        self.assertFalse(RouteSearchView._validate_destination_coordinates(float("nan"), 31.2))
 
     def test_normalize_text(self):
         self.assertEqual(RouteSearchView._normalize_text("  Abbassia  "), "abbassia")
+
+    def _suggest_with(self, scorer, query, names):
+        candidates = [
+            {
+                "destination_name": name,
+                "name_norm": name.lower(),
+                "destination_lat": 30.0,
+                "destination_lon": 31.0,
+            }
+            for name in names
+        ]
+        with mock.patch.object(
+            RouteSearchView, "_destination_candidates", return_value=candidates
+        ), mock.patch.object(orchestrator, "_text_similarity", scorer):
+            return RouteSearchView()._suggest_destination(query)
+
+    def _scorers(self):
+        scorers = [_difflib_similarity]
+        if orchestrator.fuzz is not None:
+            scorers.append(_rapidfuzz_similarity)
+        return scorers
+
+    def test_suggestion_ranking_and_cutoff_with_each_scorer(self):
+        names = ["Abbassia", "Ramses", "Tahrir Square", "Nasr City", "Maadi Degla"]
+        expected = {
+            "abasia": "Abbassia",
+            "ramsis": "Ramses",
+            "tahreer": "Tahrir Square",
+            "zzzz": None,
+        }
+        for scorer in self._scorers():
+            for query, name in expected.items():
+                with self.subTest(scorer=scorer.__name__, query=query):
+                    suggestion = self._suggest_with(scorer, query, names)
+                    self.assertEqual(suggestion and suggestion["name"], name)
+
+    def test_rapidfuzz_cutoff_is_looser_than_difflib(self):
+        if orchestrator.fuzz is None:
+            self.skipTest("rapidfuzz is not installed")
+
+        self.assertGreaterEqual(
+            _rapidfuzz_similarity(" acad", "ddbadadd a"),
+            _difflib_similarity(" acad", "ddbadadd a"),
+        )
+        self.assertIsNone(
+            self._suggest_with(_difflib_similarity, "ramsis", ["Nasr City"])
+        )
+        self.assertEqual(
+            self._suggest_with(_rapidfuzz_similarity, "ramsis", ["Nasr City"])["name"],
+            "Nasr City",
+        )
+
+
+class RouteSuccessResponseTests(SimpleTestCase):
+    def test_meta_only_response_drops_segments_without_touching_result(self):
+        option = {"type": "bus_only", "found": True, "segments": [{"method": "bus"}]}
+        response = RouteOrchestratorView._success_response(
+            request_id="req-1",
+            source="map",
+            route_result={"query": {}, "routes": [option]},
+            from_data=None,
+            to_data=None,
+            intent="direct_coordinates",
+            route_filter="bus_only",
+            selected_route=option,
+            include_segments=False,
+        )
+
+        self.assertEqual(response.data["route"]["segments"], [])
+        self.assertEqual(option["segments"], [{"method": "bus"}])
+
+
+class RouteCostTests(SimpleTestCase):
+    def test_aggregate_segments_counts_rides_and_walking(self):
+        segments = [
+            {"method": "Walking", "distanceMeters": 120.5},
+            {"method": "metro", "numStops": 4},
+            {"method": "bus"},
+            {"method": "walking", "distanceMeters": None},
+            {"method": "microbus"},
+            {"method": "BUS"},
+            {"method": "Bus"},
+            {"method": "tram"},
+        ]
+
+        self.assertEqual(
+            RouteOrchestratorView._aggregate_segments(segments),
+            (4, 3, 1, 120.5, 6),
+        )
+
+    def test_metro_fare_by_stops_uses_tier_boundaries(self):
+        fares = RouteOrchestratorView.METRO_FARE_TIER_FARES
+        self.assertEqual(RouteOrchestratorView._metro_fare_by_stops(9), fares[0])
+        self.assertEqual(RouteOrchestratorView._metro_fare_by_stops(10), fares[1])
+        self.assertEqual(RouteOrchestratorView._metro_fare_by_stops(10**10), fares[-1])
+
+
+class RouteSelectionTests(SimpleTestCase):
+    def _route_result(self):
+        return {
+            "query": {},
+            "routes": [
+                {
+                    "type": "bus_only",
+                    "found": True,
+                    "totalDurationSeconds": 1800,
+                    "segments": [{"method": "bus"}, {"method": "bus"}],
+                },
+                {
+                    "type": "metro_only",
+                    "found": True,
+                    "totalDurationSeconds": 1200,
+                    "segments": [{"method": "metro", "numStops": 3}],
+                },
+                {"type": "microbus_only", "found": False, "segments": []},
+            ],
+        }
+
+    def test_select_route_by_filter(self):
+        _, fastest = RouteOrchestratorView._select_route(
+            self._route_result(), "fastest"
+        )
+        _, bus_only = RouteOrchestratorView._select_route(
+            self._route_result(), "bus_only"
+        )
+        _, microbus_only = RouteOrchestratorView._select_route(
+            self._route_result(), "microbus_only"
+        )
+
+        self.assertEqual(fastest["type"], "metro_only")
+        self.assertEqual(bus_only["type"], "bus_only")
+        self.assertIsNone(microbus_only)
+
+    def test_select_route_costs_only_the_options_it_needs(self):
+        route_result, selected = RouteOrchestratorView._select_route(
+            self._route_result(), "metro_only"
+        )
+
+        self.assertEqual(
+            selected["estimatedFare"], RouteOrchestratorView.METRO_FARE_TIER_FARES[0]
+        )
+        self.assertNotIn("estimatedFare", route_result["routes"][0])
+        self.assertNotIn("estimatedFare", route_result["routes"][2])
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_render_matches_default_json_output(self):
+        payload = {
+            "createdAt": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            "fare": Decimal("12.50"),
+            "routes": [{"type": "metro_only", "segments": []}],
+        }
+
+        rendered = json.loads(ORJSONRenderer().render(payload))
+
+        self.assertEqual(rendered, json.loads(JSONRenderer().render(payload)))
+        self.assertEqual(rendered["createdAt"], "2024-01-02T03:04:05Z")
+
+
+class DestinationHintTests(SimpleTestCase):
+    def test_evicts_least_recently_used_query(self):
+        cache = TtlLruCache(max_size=2)
+        cache.put("abbassia", (None, (30.07, 31.28)))
+        cache.put("ramses", (None, (30.06, 31.25)))
+        cache.get("abbassia")
+        cache.put("maadi", (None, (29.96, 31.25)))
+
+        self.assertIsNone(cache.get("ramses"))
+        self.assertEqual(cache.get("abbassia"), (None, (30.07, 31.28)))
+
+    def test_zero_size_disables_hints(self):
+        cache = TtlLruCache(max_size=0)
+        cache.put("abbassia", (None, (30.07, 31.28)))
+
+        self.assertIsNone(cache.get("abbassia"))
+
+
+class RouteHistoryCursorTests(SimpleTestCase):
+    def test_cursor_round_trip(self):
+        created_at = datetime(2024, 5, 1, 8, 30, 15, 123456, tzinfo=timezone.utc)
+        cursor = RouteHistoryView._encode_cursor(created_at, 42)
+
+        self.assertEqual(RouteHistoryView._decode_cursor(cursor), (created_at, 42))
+
+    def test_malformed_cursor_is_rejected(self):
+        self.assertIsNone(RouteHistoryView._decode_cursor("not-a-cursor"))
+        self.assertIsNone(RouteHistoryView._decode_cursor("bm8tc2VwYXJhdG9y"))
+
+
+class TtlLruCacheTests(SimpleTestCase):
+    def test_entries_expire_after_ttl(self):
+        cache = TtlLruCache(max_size=4, ttl_seconds=60)
+        with mock.patch("time.monotonic", return_value=1000.0):
+            cache.put("abbassia", {"to_lat": 30.07})
+        with mock.patch("time.monotonic", return_value=1059.0):
+            self.assertEqual(cache.get("abbassia"), {"to_lat": 30.07})
+        with mock.patch("time.monotonic", return_value=1060.0):
+            self.assertIsNone(cache.get("abbassia"))
+
+    def test_snapshot_expires_after_ttl_and_zero_disables_it(self):
+        snapshot = TtlSnapshot(ttl_seconds=60)
+        with mock.patch("time.monotonic", return_value=1000.0):
+            snapshot.put(["abbassia"])
+        with mock.patch("time.monotonic", return_value=1059.0):
+            self.assertEqual(snapshot.get(), ["abbassia"])
+        with mock.patch("time.monotonic", return_value=1060.0):
+            self.assertIsNone(snapshot.get())
+
+        disabled = TtlSnapshot(ttl_seconds=0)
+        disabled.put(["abbassia"])
+        self.assertIsNone(disabled.get())
+
+
+class RequestIdTests(SimpleTestCase):
+    def test_request_ids_are_unique_uuid4_strings(self):
+        ids = [new_request_id() for _ in range(100)]
+
+        self.assertEqual(len(set(ids)), 100)
+        for request_id in ids:
+            self.assertEqual(len(request_id), 36)
+            self.assertEqual(uuid.UUID(request_id).version, 4)
+
+
+class RouteMetadataViewTests(SimpleTestCase):
+    def _get(self, **headers):
+        request = APIRequestFactory().get("/api/routes/metadata", **headers)
+        force_authenticate(request, user=User(email="rider@example.com"))
+        return RouteMetadataView.as_view()(request)
+
+    def test_metadata_is_served_with_etag(self):
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), RouteMetadataView.METADATA)
+        self.assertEqual(response["ETag"], RouteMetadataView.METADATA_ETAG)
+
+    def test_matching_etag_returns_not_modified(self):
+        response = self._get(HTTP_IF_NONE_MATCH=RouteMetadataView.METADATA_ETAG)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_schema_lists_every_metadata_field(self):
+        generator = SchemaGenerator(
+            patterns=[path("api/routes/metadata", RouteMetadataView.as_view())]
+        )
+        schema = generator.get_schema(request=None, public=True)
+        properties = schema["components"]["schemas"]["RouteMetadataResponse"][
+            "properties"
+        ]
+
+        self.assertEqual(set(properties), set(RouteMetadataView.METADATA))
+
+
+class RouteByTextViewTests(SimpleTestCase):
+    def test_missing_text_is_rejected_before_calling_ai(self):
+        ai_client = mock.Mock()
+        request = APIRequestFactory().post(
+            "/api/route/by-text", {"text": "  "}, format="json"
+        )
+        force_authenticate(request, user=User(email="rider@example.com"))
+        with mock.patch.object(
+            orchestrator, "get_ai_client", return_value=ai_client
+        ), mock.patch.object(
+            orchestrator, "get_routing_client", return_value=mock.Mock()
+        ), mock.patch.object(orchestrator, "save_route_history"):
+            response = RouteByTextView.as_view()(request)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["error"]["code"], "INVALID_REQUEST_BODY")
+        ai_client.extract_route.assert_not_called()
+
+    def test_missing_source_discards_speculative_route(self):
+        ai_client = mock.Mock()
+        ai_client.extract_route.return_value = {"to_lat": 30.1, "to_lon": 31.1}
+        request = APIRequestFactory().post(
+            "/api/route/by-text", {"text": "to Abbassia"}, format="json"
+        )
+        force_authenticate(request, user=User(email="rider@example.com"))
+        with mock.patch.object(
+            orchestrator, "get_ai_client", return_value=ai_client
+        ), mock.patch.object(
+            orchestrator, "get_routing_client", return_value=mock.Mock()
+        ), mock.patch.object(
+            orchestrator.destination_hints,
+            "get",
+            return_value=((30.0, 31.0), (30.1, 31.1)),
+        ), mock.patch.object(
+            orchestrator, "SpeculativeRoute"
+        ) as speculative_route, mock.patch.object(
+            orchestrator, "save_route_history"
+        ):
+            response = RouteByTextView.as_view()(request)
+
+        self.assertEqual(
+            response.data["error"]["code"], "SOURCE_REQUIRED_OR_CURRENT_LOCATION"
+        )
+        speculative_route.return_value.discard.assert_called_once()
+
+
+class RouteByCoordinatesViewTests(SimpleTestCase):
+    def test_routes_without_ai_client(self):
+        routing_client = mock.Mock()
+        routing_client.get_route.return_value = {
+            "query": {},
+            "routes": [
+                {
+                    "type": "bus_only",
+                    "found": True,
+                    "totalDurationSeconds": 600,
+                    "segments": [{"method": "bus"}],
+                }
+            ],
+        }
+        request = APIRequestFactory().post(
+            "/api/route/by-coordinates",
+            {
+                "origin": {"lat": 30.0, "lon": 31.0},
+                "destination": {"lat": 30.1, "lon": 31.1},
+            },
+            format="json",
+        )
+        force_authenticate(request, user=User(email="rider@example.com"))
+        with mock.patch.object(
+            orchestrator,
+            "get_ai_client",
+            side_effect=RuntimeError("interpreter gRPC stubs are not generated"),
+        ), mock.patch.object(
+            orchestrator, "get_routing_client", return_value=routing_client
+        ), mock.patch.object(orchestrator, "save_route_history"):
+            response = RouteByCoordinatesView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        routing_client.get_route.assert_called_once()
+
+
+class RouteHistoryWriterTests(SimpleTestCase):
+    @override_settings(ROUTE_HISTORY_ASYNC_WRITES=True)
+    def test_queued_row_keeps_its_submit_time(self):
+        submitted_at = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+        flushed_at = datetime(2024, 1, 1, 12, 5, tzinfo=timezone.utc)
+        with mock.patch.object(
+            async_writer.route_history_writer, "submit"
+        ) as submit, mock.patch(
+            "django.utils.timezone.now", return_value=submitted_at
+        ):
+            async_writer.save_route_history({"source_type": "map", "status": "failed"})
+
+        fields = submit.call_args[0][0]
+        with mock.patch("django.utils.timezone.now", return_value=flushed_at):
+            entry = RouteHistory(**fields)
+
+        self.assertEqual(entry.created_at, submitted_at)
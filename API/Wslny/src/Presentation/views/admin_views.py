@@ -178,7 +178,10 @@ class RouteAnalyticsBaseView(APIView):
     permission_classes = [IsAdminUser]
 
     @staticmethod
-    def _apply_filters(queryset, request):
+    def _apply_filters(request, **base_filters):
+        queryset = RouteHistory.analytics_base()
+        if base_filters:
+            queryset = queryset.filter(**base_filters)
         return RouteAnalyticsService.apply_filters(queryset, request.query_params)
 
     @staticmethod
@@ -215,7 +218,7 @@ class RouteAnalyticsOverviewView(RouteAnalyticsBaseView):
         },
     )
     def get(self, request):
-        queryset = self._apply_filters(RouteHistory.objects.all(), request)
+        queryset = self._apply_filters(request)
         totals_row = RouteAnalyticsService.query_analytics(
             queryset,
             metrics=[
@@ -227,34 +230,39 @@ class RouteAnalyticsOverviewView(RouteAnalyticsBaseView):
             group_by=[],
         )[0]["metrics"]
 
-        source_rows = RouteAnalyticsService.query_analytics(
-            queryset,
-            metrics=["requests"],
-            group_by=["source"],
-        )
+        if not totals_row.get("requests"):
+            # Nothing matches the filters, so the remaining aggregates are empty.
+            source_rows = []
+            averages = {}
+            daily_usage_rows = []
+        else:
+            source_rows = RouteAnalyticsService.query_analytics(
+                queryset,
+                metrics=["requests"],
+                group_by=["source"],
+            )
+            averages = RouteAnalyticsService.query_analytics(
+                queryset,
+                metrics=[
+                    "avg_ai_latency_ms",
+                    "avg_routing_latency_ms",
+                    "avg_total_latency_ms",
+                    "avg_duration_seconds",
+                    "avg_distance_meters",
+                ],
+                group_by=[],
+            )[0]["metrics"]
+            daily_usage_rows = RouteAnalyticsService.query_analytics(
+                queryset,
+                metrics=["requests"],
+                group_by=["day"],
+            )
+
         source_breakdown = {
             item["group"].get("source"): item["metrics"].get("requests")
             for item in source_rows
             if item["group"].get("source")
         }
-
-        averages = RouteAnalyticsService.query_analytics(
-            queryset,
-            metrics=[
-                "avg_ai_latency_ms",
-                "avg_routing_latency_ms",
-                "avg_total_latency_ms",
-                "avg_duration_seconds",
-                "avg_distance_meters",
-            ],
-            group_by=[],
-        )[0]["metrics"]
-
-        daily_usage_rows = RouteAnalyticsService.query_analytics(
-            queryset,
-            metrics=["requests"],
-            group_by=["day"],
-        )
         daily_usage = [
             {
                 "day": row["group"].get("day"),
@@ -313,10 +321,7 @@ class RouteAnalyticsTopRoutesView(RouteAnalyticsBaseView):
         },
     )
     def get(self, request):
-        queryset = self._apply_filters(
-            RouteHistory.objects.filter(status=RouteHistory.STATUS_SUCCESS),
-            request,
-        )
+        queryset = self._apply_filters(request, status=RouteHistory.STATUS_SUCCESS)
         limit, offset = RouteAnalyticsService.parse_pagination(
             request.query_params.get("limit", 10),
             request.query_params.get("offset", 0),
@@ -367,9 +372,7 @@ class RouteFilterStatsView(RouteAnalyticsBaseView):
         },
     )
     def get(self, request):
-        queryset = self._apply_filters(
-            RouteHistory.objects.filter(has_result=True), request
-        )
+        queryset = self._apply_filters(request, has_result=True)
         top_filter = (
             queryset.values("preference")
             .annotate(
@@ -429,25 +432,38 @@ class RouteUnresolvedStatsView(RouteAnalyticsBaseView):
         },
     )
     def get(self, request):
-        queryset = self._apply_filters(RouteHistory.objects.all(), request)
+        queryset = self._apply_filters(request)
         limit, offset = RouteAnalyticsService.parse_pagination(
             request.query_params.get("limit", 20),
             request.query_params.get("offset", 0),
         )
 
-        unresolved = list(
-            queryset.filter(has_result=False)
-            .exclude(unresolved_reason__isnull=True)
-            .exclude(unresolved_reason="")
-            .values("unresolved_reason")
-            .annotate(count=Count("id"))
+        reason_rows = (
+            queryset.values("unresolved_reason")
+            .annotate(
+                count=Count("id", filter=Q(has_result=False)),
+                long_walk_count=Count(
+                    "id",
+                    filter=Q(
+                        walk_distance_meters__isnull=False,
+                        walk_distance_meters__gte=settings.ROUTE_LONG_WALK_THRESHOLD_METERS,
+                    ),
+                ),
+            )
             .order_by("-count")
         )
 
-        long_walk = queryset.filter(
-            walk_distance_meters__isnull=False,
-            walk_distance_meters__gte=settings.ROUTE_LONG_WALK_THRESHOLD_METERS,
-        ).count()
+        unresolved = []
+        long_walk = 0
+        for row in reason_rows.iterator(chunk_size=500):
+            long_walk += row["long_walk_count"]
+            if row["unresolved_reason"] and row["count"]:
+                unresolved.append(
+                    {
+                        "unresolved_reason": row["unresolved_reason"],
+                        "count": row["count"],
+                    }
+                )
 
         unresolved_queries_queryset = (
             queryset.filter(has_result=False)
@@ -500,7 +516,7 @@ class RouteAnalyticsQueryView(RouteAnalyticsBaseView):
         },
     )
     def get(self, request):
-        queryset = self._apply_filters(RouteHistory.objects.all(), request)
+        queryset = self._apply_filters(request)
         try:
             options = RouteAnalyticsService.parse_query_options(request.query_params)
         except RouteAnalyticsQueryValidationError as error:
@@ -2,7 +2,6 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework_simplejwt.tokens import RefreshToken
 from drf_spectacular.utils import OpenApiExample, OpenApiResponse, extend_schema
 from src.Core.Domain.Constants.Roles import Roles
 
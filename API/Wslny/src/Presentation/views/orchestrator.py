@@ -1,8 +1,19 @@
+import base64
+import binascii
+import hashlib
+import re
+from bisect import bisect_left
+from datetime import datetime
 from django.conf import settings
-from difflib import SequenceMatcher
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Lower, Trim
+from django.http import HttpResponse
+from django.utils.http import parse_etags, quote_etag
+from functools import lru_cache, partial
 import grpc
 import time
-from uuid import uuid4
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import serializers, status
@@ -15,12 +26,18 @@ from drf_spectacular.utils import (
     extend_schema,
     inline_serializer,
 )
+from src.Infrastructure.History.async_writer import save_route_history
 from src.Infrastructure.History.models import RouteHistory
-from src.Infrastructure.GrpcClients.ai_client import AiGrpcClient, AiGrpcClientError
-from src.Infrastructure.GrpcClients.routing_client import (
-    RoutingGrpcClient,
-    RoutingGrpcClientError,
+from src.Infrastructure.GrpcClients.ai_client import AiGrpcClientError
+from src.Infrastructure.GrpcClients.caching import TtlLruCache, TtlSnapshot
+from src.Infrastructure.GrpcClients.client_factory import (
+    get_ai_client,
+    get_routing_client,
 )
+from src.Infrastructure.GrpcClients.routing_client import RoutingGrpcClientError
+from src.Infrastructure.GrpcClients.speculation import SpeculativeRoute
+from src.Presentation.renderers import ORJSONRenderer
+from src.Presentation.request_ids import new_request_id
 from src.Presentation.schemas import (
     ROUTE_FILTER_ENUM_CHOICES,
     RouteErrorResponseSerializer,
@@ -29,66 +46,387 @@ from src.Presentation.schemas import (
     RouteSuccessResponseSerializer,
 )
 
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+
+(
+    SEGMENT_WALKING,
+    SEGMENT_METRO,
+    SEGMENT_BUS,
+    SEGMENT_MICROBUS,
+    SEGMENT_OTHER,
+) = range(5)
+# Common spellings resolve without allocating a lowered copy of the method.
+SEGMENT_METHOD_KINDS = {
+    spelling: kind
+    for method, kind in (
+        ("walking", SEGMENT_WALKING),
+        ("metro", SEGMENT_METRO),
+        ("bus", SEGMENT_BUS),
+        ("microbus", SEGMENT_MICROBUS),
+    )
+    for spelling in (method, method.capitalize(), method.upper())
+}
+
+
+# rapidfuzz's ratio is an Indel (LCS) ratio, which is never lower than difflib's
+# Ratcliff-Obershelp ratio and is often higher on short names, so suggestion
+# cutoffs are looser when rapidfuzz is installed.
+def _rapidfuzz_similarity(left, right):
+    return fuzz.ratio(left, right) / 100.0
+
+
+def _difflib_similarity(left, right):
+    # Only the search fallback needs difflib, so keep it off worker startup.
+    from difflib import SequenceMatcher
+
+    return SequenceMatcher(None, left, right).ratio()
+
+
+_text_similarity = _rapidfuzz_similarity if fuzz is not None else _difflib_similarity
+
+FILTER_ENUM_TO_PREFERENCE = {
+    1: RouteHistory.PREFERENCE_OPTIMAL,
+    2: RouteHistory.PREFERENCE_FASTEST,
+    3: RouteHistory.PREFERENCE_CHEAPEST,
+    4: RouteHistory.PREFERENCE_BUS_ONLY,
+    5: RouteHistory.PREFERENCE_MICROBUS_ONLY,
+    6: RouteHistory.PREFERENCE_METRO_ONLY,
+}
+FILTER_PREFERENCE_TO_ENUM = {
+    preference: enum_value
+    for enum_value, preference in FILTER_ENUM_TO_PREFERENCE.items()
+}
+# Indexed by enum value; slot 0 is unused so integer filters index directly.
+FILTER_ENUM_TABLE = (None,) + tuple(
+    preference for _, preference in sorted(FILTER_ENUM_TO_PREFERENCE.items())
+)
+# Query-string values clients send for "no current location".
+MISSING_QUERY_VALUES = frozenset({None, "", "null"})
+# Text outside these bounds, or without a single letter, cannot name a place and
+# is rejected before it reaches the AI service.
+ROUTE_TEXT_MIN_LENGTH = 3
+ROUTE_TEXT_MAX_LENGTH = 512
+ROUTE_TEXT_LETTER = re.compile(r"[^\W\d_]")
+# "lat,lon;lat,lon" typed or pasted into the text box is routed without the AI.
+_TEXT_NUMBER = r"\s*(-?\d+(?:\.\d+)?)\s*"
+ROUTE_TEXT_COORDINATES = re.compile(
+    f"{_TEXT_NUMBER},{_TEXT_NUMBER};{_TEXT_NUMBER},{_TEXT_NUMBER}"
+)
+
+ROUTE_INCLUDE_PARAMETER = OpenApiParameter(
+    name="include",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    required=False,
+    enum=["meta"],
+    description="Pass 'meta' to omit route segments and return only the summary.",
+)
+
+# (HTTP status, error code) returned for each upstream gRPC status.
+AI_ERROR_RESPONSES = {
+    grpc.StatusCode.INVALID_ARGUMENT: (status.HTTP_400_BAD_REQUEST, "AI_INVALID_INPUT"),
+    grpc.StatusCode.NOT_FOUND: (
+        status.HTTP_422_UNPROCESSABLE_ENTITY,
+        "AI_LOCATION_NOT_FOUND",
+    ),
+    grpc.StatusCode.DEADLINE_EXCEEDED: (status.HTTP_504_GATEWAY_TIMEOUT, "AI_TIMEOUT"),
+    grpc.StatusCode.UNAVAILABLE: (
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        "AI_UNAVAILABLE",
+    ),
+}
+AI_DEFAULT_ERROR_RESPONSE = (status.HTTP_502_BAD_GATEWAY, "AI_UPSTREAM_ERROR")
+ROUTING_ERROR_RESPONSES = {
+    grpc.StatusCode.INVALID_ARGUMENT: (
+        status.HTTP_400_BAD_REQUEST,
+        "ROUTING_INVALID_INPUT",
+    ),
+    grpc.StatusCode.NOT_FOUND: (status.HTTP_404_NOT_FOUND, "ROUTING_NO_PATH"),
+    grpc.StatusCode.DEADLINE_EXCEEDED: (
+        status.HTTP_504_GATEWAY_TIMEOUT,
+        "ROUTING_TIMEOUT",
+    ),
+    grpc.StatusCode.UNAVAILABLE: (
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        "ROUTING_UNAVAILABLE",
+    ),
+}
+ROUTING_DEFAULT_ERROR_RESPONSE = (status.HTTP_502_BAD_GATEWAY, "ROUTING_UPSTREAM_ERROR")
+
+
+def _route_duration_key(option):
+    return int(option.get("totalDurationSeconds", 10**9) or 10**9)
+
+
+def _route_cheapest_key(option):
+    fare = option.get("estimatedFare")
+    return float(fare if fare is not None else 10**9), _route_duration_key(option)
+
+
+def _route_optimal_key(option):
+    return (
+        int(option.get("transportSegments", 10**9) or 10**9),
+        _route_duration_key(option),
+    )
+
+
+ROUTE_SELECTORS = {
+    RouteHistory.PREFERENCE_OPTIMAL: partial(min, key=_route_optimal_key),
+    RouteHistory.PREFERENCE_FASTEST: partial(min, key=_route_duration_key),
+    RouteHistory.PREFERENCE_CHEAPEST: partial(min, key=_route_cheapest_key),
+}
+# These filters name a route type directly, so the first found option wins.
+ROUTE_TYPE_PREFERENCES = frozenset(
+    {
+        RouteHistory.PREFERENCE_BUS_ONLY,
+        RouteHistory.PREFERENCE_MICROBUS_ONLY,
+        RouteHistory.PREFERENCE_METRO_ONLY,
+    }
+)
+COST_RANKED_PREFERENCES = frozenset(
+    {RouteHistory.PREFERENCE_OPTIMAL, RouteHistory.PREFERENCE_CHEAPEST}
+)
+# Remembers the destination the AI service last resolved for a text query; the
+# hints never expire and are only evicted by size.
+destination_hints = TtlLruCache(settings.ROUTE_DESTINATION_HINT_CACHE_SIZE)
+# The recent-destinations fallback changes slowly, so every search shares one
+# snapshot of it until the snapshot expires.
+recent_destinations = TtlSnapshot(settings.ROUTE_RECENT_DESTINATIONS_TTL_SECONDS)
+
+
+class _StageTimer:
+    """
+    Stores the nanoseconds spent inside the with block on a RouteHistoryScope.
+    """
+    __slots__ = ("scope", "field", "started_at")
+
+    def __init__(self, scope, field):
+        self.scope = scope
+        self.field = field
+        self.started_at = None
+
+    def __enter__(self):
+        self.started_at = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        setattr(self.scope, self.field, time.perf_counter_ns() - self.started_at)
+        return False
+
+
+class RouteHistoryScope:
+    __slots__ = (
+        "view",
+        "request",
+        "_request_id",
+        "source_type",
+        "input_text",
+        "preference",
+        "from_data",
+        "to_data",
+        "ai_latency_ns",
+        "routing_latency_ns",
+        "started_at",
+    )
+
+    def __init__(
+        self,
+        view,
+        request,
+        source_type=RouteHistory.SOURCE_TEXT,
+        input_text=None,
+        preference=RouteHistory.PREFERENCE_OPTIMAL,
+    ):
+        self.view = view
+        self.request = request
+        self._request_id = None
+        self.source_type = source_type
+        self.input_text = input_text
+        self.preference = preference
+        self.from_data = None
+        self.to_data = None
+        self.ai_latency_ns = None
+        self.routing_latency_ns = None
+        self.started_at = time.perf_counter_ns()
+
+    @property
+    def request_id(self):
+        if self._request_id is None:
+            self._request_id = new_request_id()
+        return self._request_id
+
+    @staticmethod
+    def elapsed_ns(started_at):
+        return time.perf_counter_ns() - started_at
+
+    def timed(self, field):
+        """Time a with block into field, even when the block raises."""
+        return _StageTimer(self, field)
+
+    @staticmethod
+    def _to_ms(nanoseconds):
+        if nanoseconds is None:
+            return None
+        # Round to the nearest millisecond; flooring would record every fast
+        # stage as 0 and pull the analytics averages low.
+        return (nanoseconds + 500_000) // 1_000_000
+
+    def _record(
+        self,
+        status_value,
+        error_code,
+        error_message,
+        unresolved_reason,
+        route_result,
+        selected_route,
+    ):
+        self.view._record_history(
+            request=self.request,
+            request_id=self.request_id,
+            source_type=self.source_type,
+            input_text=self.input_text,
+            preference=self.preference,
+            from_data=self.from_data,
+            to_data=self.to_data,
+            route_result=route_result,
+            status_value=status_value,
+            error_code=error_code,
+            error_message=error_message,
+            selected_route_type=(selected_route or {}).get("type"),
+            selected_route=selected_route,
+            unresolved_reason=unresolved_reason,
+            ai_latency_ms=self._to_ms(self.ai_latency_ns),
+            routing_latency_ms=self._to_ms(self.routing_latency_ns),
+            total_latency_ms=self._to_ms(self.elapsed_ns(self.started_at)),
+        )
+
+    def record_failure(self, error_code, message, unresolved_reason, route_result=None):
+        self._record(
+            RouteHistory.STATUS_FAILED,
+            error_code,
+            message,
+            unresolved_reason,
+            route_result,
+            None,
+        )
+
+    def fail(
+        self,
+        http_status,
+        error_code,
+        message,
+        unresolved_reason,
+        route_result=None,
+    ):
+        self.record_failure(error_code, message, unresolved_reason, route_result)
+        return self.view._error_response(
+            self.request_id, http_status, error_code, message
+        )
+
+    def succeed(self, route_result, selected_route, source, intent):
+        self._record(
+            RouteHistory.STATUS_SUCCESS,
+            None,
+            None,
+            None,
+            route_result,
+            selected_route,
+        )
+        return self.view._success_response(
+            request_id=self.request_id,
+            source=source,
+            route_result=route_result,
+            from_data=self.from_data,
+            to_data=self.to_data,
+            intent=intent,
+            route_filter=self.preference,
+            selected_route=selected_route,
+            include_segments=self.request.query_params.get("include") != "meta",
+        )
+
 
 class RouteOrchestratorView(APIView):
     permission_classes = [IsAuthenticated]
-    FILTER_ENUM_TO_PREFERENCE = {
-        1: RouteHistory.PREFERENCE_OPTIMAL,
-        2: RouteHistory.PREFERENCE_FASTEST,
-        3: RouteHistory.PREFERENCE_CHEAPEST,
-        4: RouteHistory.PREFERENCE_BUS_ONLY,
-        5: RouteHistory.PREFERENCE_MICROBUS_ONLY,
-        6: RouteHistory.PREFERENCE_METRO_ONLY,
-    }
-    FILTER_PREFERENCE_TO_ENUM = {
-        preference: enum_value
-        for enum_value, preference in FILTER_ENUM_TO_PREFERENCE.items()
-    }
+    FILTER_ENUM_TO_PREFERENCE = FILTER_ENUM_TO_PREFERENCE
+    FILTER_PREFERENCE_TO_ENUM = FILTER_PREFERENCE_TO_ENUM
+    FILTER_ENUM_TABLE = FILTER_ENUM_TABLE
+    # Sorted by stop limit so _metro_fare_by_stops can bisect, whatever order
+    # the tiers are configured in.
+    METRO_FARE_TIER_MAX_STOPS = tuple(
+        max_stops for max_stops, _ in sorted(settings.ROUTE_METRO_FARE_TIERS)
+    )
+    METRO_FARE_TIER_FARES = tuple(
+        fare for _, fare in sorted(settings.ROUTE_METRO_FARE_TIERS)
+    )
+    BUS_FARE_PER_RIDE = settings.ROUTE_BUS_FARE_PER_RIDE
+    MICROBUS_FARE_PER_RIDE = settings.ROUTE_MICROBUS_FARE_PER_RIDE
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.client_boot_error = None
+        self.ai_boot_error = None
+        self.routing_boot_error = None
         self.ai_client = None
         self.routing_client = None
 
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Schema generation instantiates views without dispatching them, so the
+        # gRPC clients are only resolved once a request is actually handled.
+        # Each is resolved on its own so map-only routes survive an AI failure.
         try:
-            self.ai_client = AiGrpcClient(
-                host=settings.AI_GRPC_HOST,
-                port=settings.AI_GRPC_PORT,
-                timeout_seconds=settings.AI_GRPC_TIMEOUT_SECONDS,
-            )
-            self.routing_client = RoutingGrpcClient(
-                host=settings.ROUTING_GRPC_HOST,
-                port=settings.ROUTING_GRPC_PORT,
-                timeout_seconds=settings.ROUTING_GRPC_TIMEOUT_SECONDS,
-            )
+            self.ai_client = get_ai_client()
         except RuntimeError as error:
-            self.client_boot_error = str(error)
+            self.ai_boot_error = str(error)
+        try:
+            self.routing_client = get_routing_client()
+        except RuntimeError as error:
+            self.routing_boot_error = str(error)
+
+    def _boot_error(self, needs_ai):
+        if needs_ai and self.ai_boot_error:
+            return self.ai_boot_error
+        return self.routing_boot_error
 
     @staticmethod
     def _parse_coordinates(data):
-        try:
-            origin = data["origin"]
-            destination = data["destination"]
-
-            s_lat = float(origin["lat"])
-            s_lon = float(origin["lon"])
-            d_lat = float(destination["lat"])
-            d_lon = float(destination["lon"])
-        except (TypeError, KeyError, ValueError):
+        origin = data.get("origin")
+        destination = data.get("destination")
+        if not (isinstance(origin, dict) and isinstance(destination, dict)):
             return None
 
-        if not (-90.0 <= s_lat <= 90.0 and -90.0 <= d_lat <= 90.0):
+        # Missing keys become None and fail float() with the malformed values.
+        try:
+            s_lat = float(origin.get("lat"))
+            s_lon = float(origin.get("lon"))
+            d_lat = float(destination.get("lat"))
+            d_lon = float(destination.get("lon"))
+        except (TypeError, ValueError):
             return None
-        if not (-180.0 <= s_lon <= 180.0 and -180.0 <= d_lon <= 180.0):
+
+        # Same bounds as _is_valid_point, inlined for both points; written as
+        # "not <=" so NaN stays invalid.
+        if not (
+            abs(s_lat) <= 90.0
+            and abs(d_lat) <= 90.0
+            and abs(s_lon) <= 180.0
+            and abs(d_lon) <= 180.0
+        ):
             return None
 
         return s_lat, s_lon, d_lat, d_lon
 
+    @staticmethod
+    def _is_valid_point(lat, lon):
+        # abs() also rejects NaN, since every comparison with it is False.
+        return abs(lat) <= 90.0 and abs(lon) <= 180.0
+
     @staticmethod
     def _parse_current_location(data, query_params=None):
-        def is_valid(lat, lon):
-            return -90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0
+        is_valid = RouteOrchestratorView._is_valid_point
 
         if "current_location" in data:
             try:
@@ -105,7 +443,7 @@ class RouteOrchestratorView(APIView):
 
         query_lat = query_params.get("current_latitude")
         query_lon = query_params.get("current_longitude")
-        if query_lat in (None, "", "null") or query_lon in (None, "", "null"):
+        if query_lat in MISSING_QUERY_VALUES or query_lon in MISSING_QUERY_VALUES:
             return None
 
         try:
@@ -122,6 +460,20 @@ class RouteOrchestratorView(APIView):
     @staticmethod
     def _parse_filter(data):
         raw_filter = data.get("filter", data.get("preference"))
+        if isinstance(raw_filter, int):
+            if 0 < raw_filter < len(FILTER_ENUM_TABLE):
+                return FILTER_ENUM_TABLE[raw_filter]
+            return RouteHistory.PREFERENCE_OPTIMAL
+
+        try:
+            return RouteOrchestratorView._normalize_filter_value(raw_filter)
+        except TypeError:
+            # Unhashable values (lists, dicts) are never valid filters.
+            return RouteHistory.PREFERENCE_OPTIMAL
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _normalize_filter_value(raw_filter):
         if raw_filter in (None, ""):
             return RouteHistory.PREFERENCE_OPTIMAL
 
@@ -130,7 +482,7 @@ class RouteOrchestratorView(APIView):
             if normalized.isdigit():
                 raw_filter = int(normalized)
             else:
-                if normalized in RouteOrchestratorView.FILTER_PREFERENCE_TO_ENUM:
+                if normalized in FILTER_PREFERENCE_TO_ENUM:
                     return normalized
                 return RouteHistory.PREFERENCE_OPTIMAL
 
@@ -139,52 +491,81 @@ class RouteOrchestratorView(APIView):
         except (TypeError, ValueError):
             return RouteHistory.PREFERENCE_OPTIMAL
 
-        return RouteOrchestratorView.FILTER_ENUM_TO_PREFERENCE.get(
+        return FILTER_ENUM_TO_PREFERENCE.get(
             enum_value,
             RouteHistory.PREFERENCE_OPTIMAL,
         )
 
     @staticmethod
     def _filter_to_enum(route_filter):
-        return RouteOrchestratorView.FILTER_PREFERENCE_TO_ENUM.get(route_filter, 1)
+        return FILTER_PREFERENCE_TO_ENUM.get(route_filter, 1)
 
     @staticmethod
     def _metro_fare_by_stops(stops_count):
-        for max_stops, fare in settings.ROUTE_METRO_FARE_TIERS:
-            if stops_count <= max_stops:
-                return fare
-        return settings.ROUTE_METRO_FARE_TIERS[-1][1]
+        fares = RouteOrchestratorView.METRO_FARE_TIER_FARES
+        index = bisect_left(RouteOrchestratorView.METRO_FARE_TIER_MAX_STOPS, stops_count)
+        return fares[min(index, len(fares) - 1)]
 
     @staticmethod
-    def _compute_route_cost(route_option):
+    def _aggregate_segments(segments):
         metro_stops = 0
         bus_rides = 0
         microbus_rides = 0
         walk_distance = 0.0
         transport_segments = 0
 
-        for segment in route_option.get("segments", []):
-            method = (segment.get("method") or "").lower()
-            if method == "walking":
-                walk_distance += float(segment.get("distanceMeters", 0) or 0)
+        method_kind = SEGMENT_METHOD_KINDS.get
+        for segment in segments:
+            field = segment.get
+            method = field("method") or ""
+            kind = method_kind(method)
+            if kind is None:
+                kind = method_kind(method.lower(), SEGMENT_OTHER)
+
+            # The routing client fills these from int32 proto fields, so they
+            # are already numbers; only missing keys need a default.
+            if kind == SEGMENT_WALKING:
+                walk_distance += field("distanceMeters") or 0
                 continue
 
             transport_segments += 1
 
-            if method == "metro":
-                metro_stops += int(segment.get("numStops", 0) or 0)
-            elif method == "bus":
+            if kind == SEGMENT_METRO:
+                metro_stops += field("numStops") or 0
+            elif kind == SEGMENT_BUS:
                 bus_rides += 1
-            elif method == "microbus":
+            elif kind == SEGMENT_MICROBUS:
                 microbus_rides += 1
 
+        return (
+            metro_stops,
+            bus_rides,
+            microbus_rides,
+            walk_distance,
+            transport_segments,
+        )
+
+    @staticmethod
+    def _compute_route_cost(route_option):
+        (
+            metro_stops,
+            bus_rides,
+            microbus_rides,
+            walk_distance,
+            transport_segments,
+        ) = RouteOrchestratorView._aggregate_segments(
+            route_option.get("segments", [])
+        )
+
         estimated_fare = 0.0
         if metro_stops > 0:
             estimated_fare += RouteOrchestratorView._metro_fare_by_stops(metro_stops)
         if bus_rides > 0:
-            estimated_fare += bus_rides * settings.ROUTE_BUS_FARE_PER_RIDE
+            estimated_fare += bus_rides * RouteOrchestratorView.BUS_FARE_PER_RIDE
         if microbus_rides > 0:
-            estimated_fare += microbus_rides * settings.ROUTE_MICROBUS_FARE_PER_RIDE
+            estimated_fare += (
+                microbus_rides * RouteOrchestratorView.MICROBUS_FARE_PER_RIDE
+            )
 
         route_option["estimatedFare"] = estimated_fare
         route_option["walkDistanceMeters"] = walk_distance
@@ -195,67 +576,41 @@ class RouteOrchestratorView(APIView):
         if "routes" not in route_result:
             return route_result, None
 
-        routes = list(route_result.get("routes", []))
-        for option in routes:
-            RouteOrchestratorView._compute_route_cost(option)
-        found_routes = [option for option in routes if option.get("found")]
+        # route_result is a fresh dict owned by this request, so cost fields are
+        # written into its route options in place instead of copying it.
+        if route_filter in ROUTE_TYPE_PREFERENCES:
+            for option in route_result["routes"]:
+                if option.get("found") and option.get("type") == route_filter:
+                    RouteOrchestratorView._compute_route_cost(option)
+                    return route_result, option
+            return route_result, None
+
+        # Only optimal and cheapest rank by cost fields; fastest just needs the
+        # cost of the option it ends up selecting.
+        ranks_by_cost = route_filter in COST_RANKED_PREFERENCES
+        found_routes = []
+        for option in route_result["routes"]:
+            if option.get("found"):
+                if ranks_by_cost:
+                    RouteOrchestratorView._compute_route_cost(option)
+                found_routes.append(option)
         if not found_routes:
-            ordered_result = dict(route_result)
-            ordered_result["routes"] = routes
-            return ordered_result, None
-
-        def duration_key(option):
-            return int(option.get("totalDurationSeconds", 10**9) or 10**9)
-
-        def cheapest_key(option):
-            fare = option.get("estimatedFare")
-            return float(fare if fare is not None else 10**9), duration_key(option)
-
-        if route_filter == RouteHistory.PREFERENCE_FASTEST:
-            selected = min(found_routes, key=duration_key)
-        elif route_filter == RouteHistory.PREFERENCE_CHEAPEST:
-            selected = min(found_routes, key=cheapest_key)
-        elif route_filter == RouteHistory.PREFERENCE_BUS_ONLY:
-            selected = next(
-                (
-                    option
-                    for option in found_routes
-                    if option.get("type") == RouteHistory.PREFERENCE_BUS_ONLY
-                ),
-                None,
-            )
-        elif route_filter == RouteHistory.PREFERENCE_MICROBUS_ONLY:
-            selected = next(
-                (
-                    option
-                    for option in found_routes
-                    if option.get("type") == RouteHistory.PREFERENCE_MICROBUS_ONLY
-                ),
-                None,
-            )
-        elif route_filter == RouteHistory.PREFERENCE_METRO_ONLY:
-            selected = next(
-                (
-                    option
-                    for option in found_routes
-                    if option.get("type") == RouteHistory.PREFERENCE_METRO_ONLY
-                ),
-                None,
-            )
-        elif route_filter == RouteHistory.PREFERENCE_OPTIMAL:
-            selected = min(
-                found_routes,
-                key=lambda option: (
-                    int(option.get("transportSegments", 10**9) or 10**9),
-                    duration_key(option),
-                ),
-            )
-        else:
-            selected = None
+            return route_result, None
 
-        ordered_result = dict(route_result)
-        ordered_result["routes"] = routes
-        return ordered_result, selected
+        selector = ROUTE_SELECTORS.get(route_filter)
+        selected = selector(found_routes) if selector else None
+        if selected is not None and not ranks_by_cost:
+            RouteOrchestratorView._compute_route_cost(selected)
+
+        return route_result, selected
+
+    @staticmethod
+    def _route_type_for(route_filter):
+        # Typed filters only ever select an option of their own type, so the
+        # routing client can skip converting the other options.
+        if route_filter in ROUTE_TYPE_PREFERENCES:
+            return route_filter
+        return None
 
     @staticmethod
     def _error_response(request_id, http_status, error_code, message):
@@ -272,27 +627,11 @@ class RouteOrchestratorView(APIView):
 
     @staticmethod
     def _map_ai_error(error):
-        if error.code == grpc.StatusCode.INVALID_ARGUMENT:
-            return status.HTTP_400_BAD_REQUEST, "AI_INVALID_INPUT"
-        if error.code == grpc.StatusCode.NOT_FOUND:
-            return status.HTTP_422_UNPROCESSABLE_ENTITY, "AI_LOCATION_NOT_FOUND"
-        if error.code == grpc.StatusCode.DEADLINE_EXCEEDED:
-            return status.HTTP_504_GATEWAY_TIMEOUT, "AI_TIMEOUT"
-        if error.code == grpc.StatusCode.UNAVAILABLE:
-            return status.HTTP_503_SERVICE_UNAVAILABLE, "AI_UNAVAILABLE"
-        return status.HTTP_502_BAD_GATEWAY, "AI_UPSTREAM_ERROR"
+        return AI_ERROR_RESPONSES.get(error.code, AI_DEFAULT_ERROR_RESPONSE)
 
     @staticmethod
     def _map_routing_error(error):
-        if error.code == grpc.StatusCode.INVALID_ARGUMENT:
-            return status.HTTP_400_BAD_REQUEST, "ROUTING_INVALID_INPUT"
-        if error.code == grpc.StatusCode.NOT_FOUND:
-            return status.HTTP_404_NOT_FOUND, "ROUTING_NO_PATH"
-        if error.code == grpc.StatusCode.DEADLINE_EXCEEDED:
-            return status.HTTP_504_GATEWAY_TIMEOUT, "ROUTING_TIMEOUT"
-        if error.code == grpc.StatusCode.UNAVAILABLE:
-            return status.HTTP_503_SERVICE_UNAVAILABLE, "ROUTING_UNAVAILABLE"
-        return status.HTTP_502_BAD_GATEWAY, "ROUTING_UPSTREAM_ERROR"
+        return ROUTING_ERROR_RESPONSES.get(error.code, ROUTING_DEFAULT_ERROR_RESPONSE)
 
     @staticmethod
     def _success_response(
@@ -304,36 +643,23 @@ class RouteOrchestratorView(APIView):
         intent,
         route_filter,
         selected_route,
+        include_segments=True,
     ):
-        payload = {
-            "request_id": request_id,
-            "source": source,
-            "intent": intent,
-            "filter": RouteOrchestratorView._filter_to_enum(route_filter),
-            "from_name": from_data.get("name") if from_data else None,
-            "to_name": to_data.get("name") if to_data else None,
-        }
-
-        response_route = None
-        if selected_route:
-            response_route = dict(selected_route)
-            response_route["type"] = route_filter
-
+        from_name, from_lat, from_lon = RouteOrchestratorView._point_fields(from_data)
+        to_name, to_lat, to_lon = RouteOrchestratorView._point_fields(to_data)
         if "query" in route_result and "routes" in route_result:
-            payload["query"] = route_result["query"]
-            payload["route"] = response_route
+            query = route_result["query"]
+            route = (
+                {**selected_route, "type": route_filter} if selected_route else None
+            )
+            if route is not None and not include_segments:
+                route["segments"] = []
         else:
-            payload["query"] = {
-                "origin": {
-                    "lat": from_data.get("lat") if from_data else None,
-                    "lon": from_data.get("lon") if from_data else None,
-                },
-                "destination": {
-                    "lat": to_data.get("lat") if to_data else None,
-                    "lon": to_data.get("lon") if to_data else None,
-                },
+            query = {
+                "origin": {"lat": from_lat, "lon": from_lon},
+                "destination": {"lat": to_lat, "lon": to_lon},
             }
-            payload["route"] = {
+            route = {
                 "type": "optimal",
                 "found": True,
                 "totalDurationSeconds": int(
@@ -345,11 +671,27 @@ class RouteOrchestratorView(APIView):
                 "segments": [],
             }
 
+        # Built as one literal so the payload is allocated at its final size.
         return Response(
-            payload,
+            {
+                "request_id": request_id,
+                "source": source,
+                "intent": intent,
+                "filter": RouteOrchestratorView._filter_to_enum(route_filter),
+                "from_name": from_name,
+                "to_name": to_name,
+                "query": query,
+                "route": route,
+            },
             status=status.HTTP_200_OK,
         )
 
+    @staticmethod
+    def _point_fields(point):
+        if not point:
+            return None, None, None
+        return point.get("name"), point.get("lat"), point.get("lon")
+
     @staticmethod
     def _extract_history_summary(selected_route):
         if not selected_route:
@@ -392,33 +734,41 @@ class RouteOrchestratorView(APIView):
             walk_distance,
             has_result,
         ) = self._extract_history_summary(selected_route)
+        origin_name, origin_lat, origin_lon = self._point_fields(from_data)
+        destination_name, destination_lat, destination_lon = self._point_fields(
+            to_data
+        )
 
-        RouteHistory.objects.create(
-            user=user,
-            request_id=request_id,
-            source_type=source_type,
-            input_text=input_text,
-            preference=preference,
-            selected_route_type=selected_route_type,
-            origin_name=from_data.get("name") if from_data else None,
-            destination_name=to_data.get("name") if to_data else None,
-            origin_lat=from_data.get("lat") if from_data else None,
-            origin_lon=from_data.get("lon") if from_data else None,
-            destination_lat=to_data.get("lat") if to_data else None,
-            destination_lon=to_data.get("lon") if to_data else None,
-            status=status_value,
-            error_code=error_code,
-            error_message=error_message,
-            total_distance_meters=total_distance,
-            total_duration_seconds=total_duration,
-            step_count=total_steps,
-            estimated_fare=estimated_fare,
-            walk_distance_meters=walk_distance,
-            has_result=has_result,
-            unresolved_reason=unresolved_reason,
-            ai_latency_ms=ai_latency_ms,
-            routing_latency_ms=routing_latency_ms,
-            total_latency_ms=total_latency_ms,
+        # Only field values are built here; the history writer creates the
+        # model instance, off the request thread when writes are async.
+        save_route_history(
+            dict(
+                user=user,
+                request_id=request_id,
+                source_type=source_type,
+                input_text=input_text,
+                preference=preference,
+                selected_route_type=selected_route_type,
+                origin_name=origin_name,
+                destination_name=destination_name,
+                origin_lat=origin_lat,
+                origin_lon=origin_lon,
+                destination_lat=destination_lat,
+                destination_lon=destination_lon,
+                status=status_value,
+                error_code=error_code,
+                error_message=error_message,
+                total_distance_meters=total_distance,
+                total_duration_seconds=total_duration,
+                step_count=total_steps,
+                estimated_fare=estimated_fare,
+                walk_distance_meters=walk_distance,
+                has_result=has_result,
+                unresolved_reason=unresolved_reason,
+                ai_latency_ms=ai_latency_ms,
+                routing_latency_ms=routing_latency_ms,
+                total_latency_ms=total_latency_ms,
+            )
         )
 
     @extend_schema(
@@ -447,6 +797,7 @@ class RouteOrchestratorView(APIView):
                 required=False,
                 description="Optional current longitude. Can be omitted/null/empty.",
             ),
+            ROUTE_INCLUDE_PARAMETER,
         ],
         responses={
             200: RouteSuccessResponseSerializer,
@@ -487,462 +838,439 @@ class RouteOrchestratorView(APIView):
         ],
     )
     def post(self, request):
-        request_id = str(uuid4())
-        request_start = time.perf_counter()
+        data = request.data
+        raw_text = data.get("text")
+        history = RouteHistoryScope(self, request, input_text=raw_text)
+        unavailable = self._check_clients(history, needs_ai=True)
+        if unavailable is not None:
+            return unavailable
 
-        if self.client_boot_error:
-            total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-            self._record_history(
-                request=request,
-                request_id=request_id,
-                source_type=RouteHistory.SOURCE_TEXT,
-                input_text=request.data.get("text"),
-                preference=RouteHistory.PREFERENCE_OPTIMAL,
-                from_data=None,
-                to_data=None,
-                route_result=None,
-                status_value=RouteHistory.STATUS_FAILED,
-                error_code="API_CLIENT_BOOT_ERROR",
-                error_message=self.client_boot_error,
-                unresolved_reason="api_boot_error",
-                ai_latency_ms=None,
-                routing_latency_ms=None,
-                total_latency_ms=total_latency_ms,
+        history.preference = self._parse_filter(data)
+
+        text_query = raw_text.strip() if isinstance(raw_text, str) else ""
+        has_text = text_query != ""
+        has_coordinates = "origin" in data and "destination" in data
+
+        if has_text and has_coordinates:
+            return history.fail(
+                status.HTTP_400_BAD_REQUEST,
+                "INVALID_REQUEST_MODE",
+                "Provide either text or origin/destination, not both.",
+                unresolved_reason="invalid_request_mode",
             )
-            return self._error_response(
-                request_id,
+
+        if has_coordinates:
+            return self._route_by_coordinates(history, data)
+
+        if has_text:
+            return self._route_by_text(
+                history,
+                text_query,
+                self._parse_current_location(data, request.query_params),
+            )
+
+        return history.fail(
+            status.HTTP_400_BAD_REQUEST,
+            "INVALID_REQUEST_BODY",
+            "Provide either 'text' or both 'origin' and 'destination'.",
+            unresolved_reason="invalid_body",
+        )
+
+    @staticmethod
+    def _parse_text_coordinates(text_query):
+        match = ROUTE_TEXT_COORDINATES.fullmatch(text_query)
+        if match is None:
+            return None
+        s_lat, s_lon, d_lat, d_lon = map(float, match.groups())
+        is_valid = RouteOrchestratorView._is_valid_point
+        if not (is_valid(s_lat, s_lon) and is_valid(d_lat, d_lon)):
+            return None
+        return s_lat, s_lon, d_lat, d_lon
+
+    @staticmethod
+    def _is_routable_text(text_query):
+        return (
+            ROUTE_TEXT_MIN_LENGTH <= len(text_query) <= ROUTE_TEXT_MAX_LENGTH
+            and ROUTE_TEXT_LETTER.search(text_query) is not None
+        )
+
+    def _check_clients(self, history, needs_ai):
+        boot_error = self._boot_error(needs_ai)
+        if boot_error:
+            return history.fail(
                 status.HTTP_503_SERVICE_UNAVAILABLE,
                 "API_CLIENT_BOOT_ERROR",
-                self.client_boot_error,
+                boot_error,
+                unresolved_reason="api_boot_error",
             )
 
-        if self.ai_client is None or self.routing_client is None:
-            total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-            self._record_history(
-                request=request,
-                request_id=request_id,
-                source_type=RouteHistory.SOURCE_TEXT,
-                input_text=request.data.get("text"),
-                preference=RouteHistory.PREFERENCE_OPTIMAL,
-                from_data=None,
-                to_data=None,
-                route_result=None,
-                status_value=RouteHistory.STATUS_FAILED,
-                error_code="API_CLIENT_UNAVAILABLE",
-                error_message="gRPC clients are not available.",
-                unresolved_reason="api_client_unavailable",
-                ai_latency_ms=None,
-                routing_latency_ms=None,
-                total_latency_ms=total_latency_ms,
-            )
-            return self._error_response(
-                request_id,
+        if (needs_ai and self.ai_client is None) or self.routing_client is None:
+            return history.fail(
                 status.HTTP_503_SERVICE_UNAVAILABLE,
                 "API_CLIENT_UNAVAILABLE",
                 "gRPC clients are not available.",
+                unresolved_reason="api_client_unavailable",
+            )
+        return None
+
+    def _route_by_coordinates(self, history, data):
+        history.source_type = RouteHistory.SOURCE_MAP
+        history.input_text = None
+        parsed = self._parse_coordinates(data)
+        if parsed is None:
+            return history.fail(
+                status.HTTP_400_BAD_REQUEST,
+                "INVALID_COORDINATES",
+                "Invalid coordinate format.",
+                unresolved_reason="invalid_coordinates",
             )
 
-        data = request.data
-        route_filter = self._parse_filter(data)
-
-        has_text = (
-            isinstance(data.get("text"), str) and data.get("text", "").strip() != ""
+        s_lat, s_lon, d_lat, d_lon = parsed
+        history.from_data = {"name": None, "lat": s_lat, "lon": s_lon}
+        history.to_data = {"name": None, "lat": d_lat, "lon": d_lon}
+
+        return self._route_and_respond(
+            history,
+            s_lat,
+            s_lon,
+            d_lat,
+            d_lon,
+            source="map",
+            intent="direct_coordinates",
         )
-        has_coordinates = "origin" in data and "destination" in data
-        current_location = self._parse_current_location(data, request.query_params)
 
-        if has_text and has_coordinates:
-            total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-            self._record_history(
-                request=request,
-                request_id=request_id,
-                source_type=RouteHistory.SOURCE_TEXT,
-                input_text=data.get("text"),
-                preference=route_filter,
-                from_data=None,
-                to_data=None,
-                route_result=None,
-                status_value=RouteHistory.STATUS_FAILED,
-                error_code="INVALID_REQUEST_MODE",
-                error_message="Provide either text or origin/destination, not both.",
-                selected_route_type=None,
-                unresolved_reason="invalid_request_mode",
-                ai_latency_ms=None,
-                routing_latency_ms=None,
-                total_latency_ms=total_latency_ms,
+    def _route_by_text(self, history, text_query, current_location):
+        history.input_text = text_query
+        coordinates = self._parse_text_coordinates(text_query)
+        if coordinates is not None:
+            s_lat, s_lon, d_lat, d_lon = coordinates
+            history.from_data = {"name": None, "lat": s_lat, "lon": s_lon}
+            history.to_data = {"name": None, "lat": d_lat, "lon": d_lon}
+            return self._route_and_respond(
+                history,
+                s_lat,
+                s_lon,
+                d_lat,
+                d_lon,
+                source="text",
+                intent="direct_coordinates",
             )
-            return self._error_response(
-                request_id,
+
+        if not self._is_routable_text(text_query):
+            return history.fail(
                 status.HTTP_400_BAD_REQUEST,
-                "INVALID_REQUEST_MODE",
-                "Provide either text or origin/destination, not both.",
+                "INVALID_TEXT",
+                "Text is too short, too long, or does not name a location.",
+                unresolved_reason="invalid_text",
             )
 
-        if has_coordinates:
-            source_type = RouteHistory.SOURCE_MAP
-            parsed = self._parse_coordinates(data)
-            if parsed is None:
-                total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-                self._record_history(
-                    request=request,
-                    request_id=request_id,
-                    source_type=source_type,
-                    input_text=None,
-                    preference=route_filter,
-                    from_data=None,
-                    to_data=None,
-                    route_result=None,
-                    status_value=RouteHistory.STATUS_FAILED,
-                    error_code="INVALID_COORDINATES",
-                    error_message="Invalid coordinate format.",
-                    selected_route_type=None,
-                    unresolved_reason="invalid_coordinates",
-                    ai_latency_ms=None,
-                    routing_latency_ms=None,
-                    total_latency_ms=total_latency_ms,
-                )
-                return self._error_response(
-                    request_id,
-                    status.HTTP_400_BAD_REQUEST,
-                    "INVALID_COORDINATES",
-                    "Invalid coordinate format.",
-                )
-
-            s_lat, s_lon, d_lat, d_lon = parsed
-            from_data = {"name": None, "lat": s_lat, "lon": s_lon}
-            to_data = {"name": None, "lat": d_lat, "lon": d_lon}
-
-            routing_start = time.perf_counter()
-            try:
-                route_result = self.routing_client.get_route(s_lat, s_lon, d_lat, d_lon)
-            except RoutingGrpcClientError as error:
-                routing_latency_ms = (time.perf_counter() - routing_start) * 1000.0
-                total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-                http_status, error_code = self._map_routing_error(error)
-                self._record_history(
-                    request=request,
-                    request_id=request_id,
-                    source_type=source_type,
-                    input_text=None,
-                    preference=route_filter,
-                    from_data=from_data,
-                    to_data=to_data,
-                    route_result=None,
-                    status_value=RouteHistory.STATUS_FAILED,
-                    error_code=error_code,
-                    error_message=error.details,
-                    selected_route_type=None,
-                    unresolved_reason="routing_error",
-                    ai_latency_ms=None,
-                    routing_latency_ms=routing_latency_ms,
-                    total_latency_ms=total_latency_ms,
-                )
-                return self._error_response(
-                    request_id, http_status, error_code, error.details
-                )
-
-            route_result, selected_route = self._select_route(
-                route_result, route_filter
+        speculative_route = self._start_speculative_route(text_query, current_location)
+        try:
+            with history.timed("ai_latency_ns"):
+                ai_result = self.ai_client.extract_route(text_query)
+        except AiGrpcClientError as error:
+            self._discard_speculation(speculative_route)
+            http_status, error_code = self._map_ai_error(error)
+            return history.fail(
+                http_status,
+                error_code,
+                error.details,
+                unresolved_reason="ai_error",
             )
-            if selected_route is None:
-                routing_latency_ms = (time.perf_counter() - routing_start) * 1000.0
-                total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-                self._record_history(
-                    request=request,
-                    request_id=request_id,
-                    source_type=source_type,
-                    input_text=None,
-                    preference=route_filter,
-                    from_data=from_data,
-                    to_data=to_data,
-                    route_result=route_result,
-                    status_value=RouteHistory.STATUS_FAILED,
-                    error_code="ROUTING_NO_MATCHING_FILTER",
-                    error_message=f"No route found for filter '{route_filter}'.",
-                    selected_route_type=None,
-                    selected_route=None,
-                    unresolved_reason="routing_no_matching_filter",
-                    ai_latency_ms=None,
-                    routing_latency_ms=routing_latency_ms,
-                    total_latency_ms=total_latency_ms,
-                )
-                return self._error_response(
-                    request_id,
-                    status.HTTP_404_NOT_FOUND,
-                    "ROUTING_NO_MATCHING_FILTER",
-                    f"No route found for filter '{route_filter}'.",
-                )
-            routing_latency_ms = (time.perf_counter() - routing_start) * 1000.0
-            total_latency_ms = (time.perf_counter() - request_start) * 1000.0
 
-            self._record_history(
-                request=request,
-                request_id=request_id,
-                source_type=source_type,
-                input_text=None,
-                preference=route_filter,
-                from_data=from_data,
-                to_data=to_data,
-                route_result=route_result,
-                status_value=RouteHistory.STATUS_SUCCESS,
-                error_code=None,
-                error_message=None,
-                selected_route_type=(selected_route or {}).get("type"),
-                selected_route=selected_route,
-                unresolved_reason=None,
-                ai_latency_ms=None,
-                routing_latency_ms=routing_latency_ms,
-                total_latency_ms=total_latency_ms,
+        if not ai_result:
+            self._discard_speculation(speculative_route)
+            return history.fail(
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                "AI_EMPTY_RESULT",
+                "AI service returned no coordinates.",
+                unresolved_reason="ai_empty",
             )
 
-            return self._success_response(
-                request_id=request_id,
-                source="map",
-                route_result=route_result,
-                from_data=from_data,
-                to_data=to_data,
-                intent="direct_coordinates",
-                route_filter=route_filter,
-                selected_route=selected_route,
+        explicit_source = None
+        if "from_lat" in ai_result and "from_lon" in ai_result:
+            source_lat = ai_result["from_lat"]
+            source_lon = ai_result["from_lon"]
+            from_name = ai_result.get("from_location")
+            explicit_source = (source_lat, source_lon)
+        elif current_location is not None:
+            source_lat, source_lon = current_location
+            from_name = "current_location"
+        else:
+            self._discard_speculation(speculative_route)
+            return history.fail(
+                status.HTTP_400_BAD_REQUEST,
+                "SOURCE_REQUIRED_OR_CURRENT_LOCATION",
+                "Source location is missing. Provide current_location.",
+                unresolved_reason="missing_source",
             )
 
-        if has_text:
-            source_type = RouteHistory.SOURCE_TEXT
-            text_query = data["text"].strip()
-            ai_start = time.perf_counter()
-            try:
-                ai_result = self.ai_client.extract_route(text_query)
-            except AiGrpcClientError as error:
-                ai_latency_ms = (time.perf_counter() - ai_start) * 1000.0
-                total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-                http_status, error_code = self._map_ai_error(error)
-                self._record_history(
-                    request=request,
-                    request_id=request_id,
-                    source_type=source_type,
-                    input_text=text_query,
-                    preference=route_filter,
-                    from_data=None,
-                    to_data=None,
-                    route_result=None,
-                    status_value=RouteHistory.STATUS_FAILED,
-                    error_code=error_code,
-                    error_message=error.details,
-                    selected_route_type=None,
-                    unresolved_reason="ai_error",
-                    ai_latency_ms=ai_latency_ms,
-                    routing_latency_ms=None,
-                    total_latency_ms=total_latency_ms,
-                )
-                return self._error_response(
-                    request_id, http_status, error_code, error.details
-                )
+        history.from_data = {
+            "name": from_name,
+            "lat": source_lat,
+            "lon": source_lon,
+        }
+        history.to_data = {
+            "name": ai_result.get("to_location"),
+            "lat": ai_result["to_lat"],
+            "lon": ai_result["to_lon"],
+        }
+        destination_hints.put(
+            text_query,
+            (explicit_source, (ai_result["to_lat"], ai_result["to_lon"])),
+        )
 
-            ai_latency_ms = (time.perf_counter() - ai_start) * 1000.0
-            if not ai_result:
-                total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-                self._record_history(
-                    request=request,
-                    request_id=request_id,
-                    source_type=source_type,
-                    input_text=text_query,
-                    preference=route_filter,
-                    from_data=None,
-                    to_data=None,
-                    route_result=None,
-                    status_value=RouteHistory.STATUS_FAILED,
-                    error_code="AI_EMPTY_RESULT",
-                    error_message="AI service returned no coordinates.",
-                    selected_route_type=None,
-                    unresolved_reason="ai_empty",
-                    ai_latency_ms=ai_latency_ms,
-                    routing_latency_ms=None,
-                    total_latency_ms=total_latency_ms,
-                )
-                return self._error_response(
-                    request_id,
-                    status.HTTP_422_UNPROCESSABLE_ENTITY,
-                    "AI_EMPTY_RESULT",
-                    "AI service returned no coordinates.",
-                )
+        return self._route_and_respond(
+            history,
+            source_lat,
+            source_lon,
+            ai_result["to_lat"],
+            ai_result["to_lon"],
+            source="text",
+            intent=ai_result.get("intent", "unknown"),
+            speculative_route=speculative_route,
+        )
 
-            if "from_lat" in ai_result and "from_lon" in ai_result:
-                source_lat = ai_result["from_lat"]
-                source_lon = ai_result["from_lon"]
-                from_name = ai_result.get("from_location")
-            elif current_location is not None:
-                source_lat, source_lon = current_location
-                from_name = "current_location"
-            else:
-                total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-                self._record_history(
-                    request=request,
-                    request_id=request_id,
-                    source_type=source_type,
-                    input_text=text_query,
-                    preference=route_filter,
-                    from_data=None,
-                    to_data=None,
-                    route_result=None,
-                    status_value=RouteHistory.STATUS_FAILED,
-                    error_code="SOURCE_REQUIRED_OR_CURRENT_LOCATION",
-                    error_message="Source location is missing. Provide current_location.",
-                    selected_route_type=None,
-                    unresolved_reason="missing_source",
-                    ai_latency_ms=ai_latency_ms,
-                    routing_latency_ms=None,
-                    total_latency_ms=total_latency_ms,
-                )
-                return self._error_response(
-                    request_id,
-                    status.HTTP_400_BAD_REQUEST,
-                    "SOURCE_REQUIRED_OR_CURRENT_LOCATION",
-                    "Source location is missing. Provide current_location.",
-                )
+    @staticmethod
+    def _routing_elapsed_ns(history, routing_start, speculative_route):
+        if speculative_route is None:
+            return history.elapsed_ns(routing_start)
+        # The call overlapped the AI request, so report its own duration.
+        return speculative_route.elapsed_ns()
 
-            from_data = {
-                "name": from_name,
-                "lat": source_lat,
-                "lon": source_lon,
-            }
-            to_data = {
-                "name": ai_result.get("to_location"),
-                "lat": ai_result["to_lat"],
-                "lon": ai_result["to_lon"],
-            }
+    @staticmethod
+    def _discard_speculation(speculative_route):
+        if speculative_route is not None:
+            speculative_route.discard()
 
-            routing_start = time.perf_counter()
-            try:
+    def _start_speculative_route(self, text_query, current_location):
+        hint = destination_hints.get(text_query)
+        if hint is None:
+            return None
+
+        source, destination = hint
+        if source is None:
+            if current_location is None:
+                return None
+            source = current_location
+        return SpeculativeRoute(self.routing_client, (*source, *destination))
+
+    def _route_and_respond(
+        self,
+        history,
+        s_lat,
+        s_lon,
+        d_lat,
+        d_lon,
+        source,
+        intent,
+        speculative_route=None,
+    ):
+        coordinates = (s_lat, s_lon, d_lat, d_lon)
+        if speculative_route is not None and not speculative_route.matches(
+            coordinates
+        ):
+            self._discard_speculation(speculative_route)
+            speculative_route = None
+
+        route_type = self._route_type_for(history.preference)
+        routing_start = time.perf_counter_ns()
+        try:
+            if speculative_route is None:
                 route_result = self.routing_client.get_route(
-                    source_lat,
-                    source_lon,
-                    ai_result["to_lat"],
-                    ai_result["to_lon"],
-                )
-            except RoutingGrpcClientError as error:
-                routing_latency_ms = (time.perf_counter() - routing_start) * 1000.0
-                total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-                http_status, error_code = self._map_routing_error(error)
-                self._record_history(
-                    request=request,
-                    request_id=request_id,
-                    source_type=source_type,
-                    input_text=text_query,
-                    preference=route_filter,
-                    from_data=from_data,
-                    to_data=to_data,
-                    route_result=None,
-                    status_value=RouteHistory.STATUS_FAILED,
-                    error_code=error_code,
-                    error_message=error.details,
-                    selected_route_type=None,
-                    unresolved_reason="routing_error",
-                    ai_latency_ms=ai_latency_ms,
-                    routing_latency_ms=routing_latency_ms,
-                    total_latency_ms=total_latency_ms,
-                )
-                return self._error_response(
-                    request_id, http_status, error_code, error.details
+                    *coordinates, route_type=route_type
                 )
-
-            route_result, selected_route = self._select_route(
-                route_result, route_filter
+            else:
+                route_result = speculative_route.result(route_type)
+        except RoutingGrpcClientError as error:
+            history.routing_latency_ns = self._routing_elapsed_ns(
+                history, routing_start, speculative_route
             )
-            if selected_route is None:
-                routing_latency_ms = (time.perf_counter() - routing_start) * 1000.0
-                total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-                self._record_history(
-                    request=request,
-                    request_id=request_id,
-                    source_type=source_type,
-                    input_text=text_query,
-                    preference=route_filter,
-                    from_data=from_data,
-                    to_data=to_data,
-                    route_result=route_result,
-                    status_value=RouteHistory.STATUS_FAILED,
-                    error_code="ROUTING_NO_MATCHING_FILTER",
-                    error_message=f"No route found for filter '{route_filter}'.",
-                    selected_route_type=None,
-                    selected_route=None,
-                    unresolved_reason="routing_no_matching_filter",
-                    ai_latency_ms=ai_latency_ms,
-                    routing_latency_ms=routing_latency_ms,
-                    total_latency_ms=total_latency_ms,
-                )
-                return self._error_response(
-                    request_id,
-                    status.HTTP_404_NOT_FOUND,
-                    "ROUTING_NO_MATCHING_FILTER",
-                    f"No route found for filter '{route_filter}'.",
-                )
-            routing_latency_ms = (time.perf_counter() - routing_start) * 1000.0
-            total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-            self._record_history(
-                request=request,
-                request_id=request_id,
-                source_type=source_type,
-                input_text=text_query,
-                preference=route_filter,
-                from_data=from_data,
-                to_data=to_data,
-                route_result=route_result,
-                status_value=RouteHistory.STATUS_SUCCESS,
-                error_code=None,
-                error_message=None,
-                selected_route_type=(selected_route or {}).get("type"),
-                selected_route=selected_route,
-                unresolved_reason=None,
-                ai_latency_ms=ai_latency_ms,
-                routing_latency_ms=routing_latency_ms,
-                total_latency_ms=total_latency_ms,
+            http_status, error_code = self._map_routing_error(error)
+            return history.fail(
+                http_status,
+                error_code,
+                error.details,
+                unresolved_reason="routing_error",
             )
 
-            return self._success_response(
-                request_id=request_id,
-                source="text",
+        route_result, selected_route = self._select_route(
+            route_result, history.preference
+        )
+        history.routing_latency_ns = self._routing_elapsed_ns(
+            history, routing_start, speculative_route
+        )
+        if selected_route is None:
+            return history.fail(
+                status.HTTP_404_NOT_FOUND,
+                "ROUTING_NO_MATCHING_FILTER",
+                f"No route found for filter '{history.preference}'.",
+                unresolved_reason="routing_no_matching_filter",
                 route_result=route_result,
-                from_data=from_data,
-                to_data=to_data,
-                intent=ai_result.get("intent", "unknown"),
-                route_filter=route_filter,
-                selected_route=selected_route,
             )
 
-        total_latency_ms = (time.perf_counter() - request_start) * 1000.0
-        self._record_history(
-            request=request,
-            request_id=request_id,
-            source_type=RouteHistory.SOURCE_TEXT,
-            input_text=data.get("text"),
-            preference=route_filter,
-            from_data=None,
-            to_data=None,
-            route_result=None,
-            status_value=RouteHistory.STATUS_FAILED,
-            error_code="INVALID_REQUEST_BODY",
-            error_message="Provide either 'text' or both 'origin' and 'destination'.",
-            selected_route_type=None,
-            unresolved_reason="invalid_body",
-            ai_latency_ms=None,
-            routing_latency_ms=None,
-            total_latency_ms=total_latency_ms,
+        return history.succeed(
+            route_result,
+            selected_route,
+            source=source,
+            intent=intent,
         )
-        return self._error_response(
-            request_id,
-            status.HTTP_400_BAD_REQUEST,
-            "INVALID_REQUEST_BODY",
-            "Provide either 'text' or both 'origin' and 'destination'.",
+
+
+class RouteByCoordinatesView(RouteOrchestratorView):
+    """
+    POST /api/route restricted to origin/destination requests.
+    """
+
+    @extend_schema(
+        tags=["Routing"],
+        summary="Get route between map pins",
+        description=(
+            "Same as POST /api/route with origin/destination, without text mode. "
+            "Filter enum values: 1=optimal, 2=fastest, 3=cheapest, "
+            "4=bus_only, 5=microbus_only, 6=metro_only."
+        ),
+        request=RouteRequestSerializer,
+        parameters=[ROUTE_INCLUDE_PARAMETER],
+        responses={
+            200: RouteSuccessResponseSerializer,
+            400: OpenApiResponse(response=RouteErrorResponseSerializer),
+            401: OpenApiResponse(response=RouteErrorResponseSerializer),
+            404: OpenApiResponse(response=RouteErrorResponseSerializer),
+            503: OpenApiResponse(response=RouteErrorResponseSerializer),
+            504: OpenApiResponse(response=RouteErrorResponseSerializer),
+        },
+    )
+    def post(self, request):
+        data = request.data
+        history = RouteHistoryScope(
+            self, request, source_type=RouteHistory.SOURCE_MAP
+        )
+        unavailable = self._check_clients(history, needs_ai=False)
+        if unavailable is not None:
+            return unavailable
+
+        history.preference = self._parse_filter(data)
+        return self._route_by_coordinates(history, data)
+
+
+class RouteByTextView(RouteOrchestratorView):
+    """
+    POST /api/route restricted to text requests.
+    """
+
+    @extend_schema(
+        tags=["Routing"],
+        summary="Get route by text",
+        description=(
+            "Same as POST /api/route with text, without map-pin mode. "
+            "Optional query params current_latitude/current_longitude are used "
+            "when the text does not include a source location."
+        ),
+        request=RouteRequestSerializer,
+        parameters=[ROUTE_INCLUDE_PARAMETER],
+        responses={
+            200: RouteSuccessResponseSerializer,
+            400: OpenApiResponse(response=RouteErrorResponseSerializer),
+            401: OpenApiResponse(response=RouteErrorResponseSerializer),
+            404: OpenApiResponse(response=RouteErrorResponseSerializer),
+            422: OpenApiResponse(response=RouteErrorResponseSerializer),
+            503: OpenApiResponse(response=RouteErrorResponseSerializer),
+            504: OpenApiResponse(response=RouteErrorResponseSerializer),
+        },
+    )
+    def post(self, request):
+        data = request.data
+        raw_text = data.get("text")
+        history = RouteHistoryScope(self, request, input_text=raw_text)
+        unavailable = self._check_clients(history, needs_ai=True)
+        if unavailable is not None:
+            return unavailable
+
+        history.preference = self._parse_filter(data)
+        text_query = raw_text.strip() if isinstance(raw_text, str) else ""
+        if not text_query:
+            return history.fail(
+                status.HTTP_400_BAD_REQUEST,
+                "INVALID_REQUEST_BODY",
+                "Provide 'text'.",
+                unresolved_reason="invalid_body",
+            )
+
+        return self._route_by_text(
+            history,
+            text_query,
+            self._parse_current_location(data, request.query_params),
         )
 
 
 class RouteHistoryView(APIView):
     permission_classes = [IsAuthenticated]
+    # Column order matches HISTORY_KEYS; the trailing id only feeds the cursor.
+    HISTORY_FIELDS = (
+        "request_id",
+        "source_type",
+        "input_text",
+        "preference",
+        "selected_route_type",
+        "origin_name",
+        "destination_name",
+        "status",
+        "error_code",
+        "total_distance_meters",
+        "total_duration_seconds",
+        "estimated_fare",
+        "walk_distance_meters",
+        "created_at",
+        "id",
+    )
+    HISTORY_KEYS = (
+        "request_id",
+        "source_type",
+        "input_text",
+        "filter",
+        "selected_route_type",
+        "origin_name",
+        "destination_name",
+        "status",
+        "error_code",
+        "total_distance_meters",
+        "total_duration_seconds",
+        "estimated_fare",
+        "walk_distance_meters",
+        "created_at",
+    )
 
     @extend_schema(
         tags=["Routing"],
         summary="Get current user route history",
-        responses={200: RouteHistoryItemSerializer(many=True)},
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Page size between 1 and 100. Defaults to 50.",
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Value of X-Next-Cursor from the previous page.",
+            ),
+            OpenApiParameter(
+                name="X-Next-Cursor",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.HEADER,
+                response=[200],
+                description="Cursor for the next page; absent on the last page.",
+            ),
+        ],
+        responses={
+            200: RouteHistoryItemSerializer(many=True),
+            400: OpenApiResponse(response=RouteErrorResponseSerializer),
+        },
     )
     def get(self, request):
         try:
@@ -950,34 +1278,89 @@ class RouteHistoryView(APIView):
         except (TypeError, ValueError):
             limit = 50
         limit = min(max(limit, 1), 100)
-        entries = RouteHistory.objects.filter(user=request.user).order_by(
-            "-created_at"
-        )[:limit]
+        entries = RouteHistory.objects.filter(user=request.user)
 
-        payload = [
-            {
-                "request_id": item.request_id,
-                "source_type": item.source_type,
-                "input_text": item.input_text,
-                "filter": item.preference,
-                "selected_route_type": item.selected_route_type,
-                "origin_name": item.origin_name,
-                "destination_name": item.destination_name,
-                "status": item.status,
-                "error_code": item.error_code,
-                "total_distance_meters": item.total_distance_meters,
-                "total_duration_seconds": item.total_duration_seconds,
-                "estimated_fare": item.estimated_fare,
-                "walk_distance_meters": item.walk_distance_meters,
-                "created_at": item.created_at,
-            }
-            for item in entries
-        ]
-        return Response(payload, status=status.HTTP_200_OK)
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            position = self._decode_cursor(cursor)
+            if position is None:
+                return Response(
+                    {
+                        "error": {
+                            "code": "INVALID_HISTORY_CURSOR",
+                            "message": "cursor is malformed.",
+                        }
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            created_at, last_id = position
+            entries = entries.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=last_id)
+            )
+
+        # A page is at most 100 rows, so it is fetched in one round trip rather
+        # than through a server-side cursor.
+        rows = list(
+            entries.order_by("-created_at", "-id").values_list(*self.HISTORY_FIELDS)[
+                :limit
+            ]
+        )
+
+        keys = self.HISTORY_KEYS
+        response = Response(
+            [dict(zip(keys, row)) for row in rows], status=status.HTTP_200_OK
+        )
+        if len(rows) == limit:
+            last = rows[-1]
+            response["X-Next-Cursor"] = self._encode_cursor(last[-2], last[-1])
+        return response
+
+    @staticmethod
+    def _encode_cursor(created_at, entry_id):
+        raw = f"{created_at.isoformat()}|{entry_id}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+            created_at, entry_id = raw.split("|")
+            return datetime.fromisoformat(created_at), int(entry_id)
+        except (binascii.Error, UnicodeError, ValueError):
+            return None
 
 
 class RouteMetadataView(APIView):
     permission_classes = [IsAuthenticated]
+    METADATA = {
+        "filters": [
+            {"value": value, "name": name} for value, name in ROUTE_FILTER_ENUM_CHOICES
+        ],
+        "request_modes": ["text", "map"],
+        "text_length": {"min": ROUTE_TEXT_MIN_LENGTH, "max": ROUTE_TEXT_MAX_LENGTH},
+        "query_params": [
+            {
+                "name": "current_latitude",
+                "type": "float",
+                "required": False,
+                "nullable": True,
+            },
+            {
+                "name": "current_longitude",
+                "type": "float",
+                "required": False,
+                "nullable": True,
+            },
+        ],
+        "coordinate_bounds": {
+            "latitude": {"min": -90.0, "max": 90.0},
+            "longitude": {"min": -180.0, "max": 180.0},
+        },
+        "transport_methods": ["walking", "bus", "microbus", "metro"],
+    }
+    # The metadata only changes with a deploy, so it is rendered once.
+    METADATA_BODY = ORJSONRenderer().render(METADATA)
+    METADATA_ETAG = quote_etag(hashlib.sha1(METADATA_BODY).hexdigest())
 
     @extend_schema(
         tags=["Routing"],
@@ -990,6 +1373,7 @@ class RouteMetadataView(APIView):
                     "request_modes": serializers.ListField(
                         child=serializers.CharField()
                     ),
+                    "text_length": serializers.DictField(),
                     "query_params": serializers.ListField(
                         child=serializers.DictField()
                     ),
@@ -1002,79 +1386,105 @@ class RouteMetadataView(APIView):
         },
     )
     def get(self, request):
-        filters = [
-            {"value": value, "name": name} for value, name in ROUTE_FILTER_ENUM_CHOICES
-        ]
-        return Response(
-            {
-                "filters": filters,
-                "request_modes": ["text", "map"],
-                "query_params": [
-                    {
-                        "name": "current_latitude",
-                        "type": "float",
-                        "required": False,
-                        "nullable": True,
-                    },
-                    {
-                        "name": "current_longitude",
-                        "type": "float",
-                        "required": False,
-                        "nullable": True,
-                    },
-                ],
-                "coordinate_bounds": {
-                    "latitude": {"min": -90.0, "max": 90.0},
-                    "longitude": {"min": -180.0, "max": 180.0},
-                },
-                "transport_methods": ["walking", "bus", "microbus", "metro"],
-            },
-            status=status.HTTP_200_OK,
-        )
+        if_none_match = request.headers.get("If-None-Match", "")
+        if self.METADATA_ETAG in parse_etags(if_none_match):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = HttpResponse(
+                self.METADATA_BODY,
+                content_type="application/json",
+                status=status.HTTP_200_OK,
+            )
+        response["ETag"] = self.METADATA_ETAG
+        return response
 
 
 class RouteSearchView(RouteOrchestratorView):
     permission_classes = [IsAuthenticated]
+    # Tuned on difflib scores; rapidfuzz scores the same pairs at least as high,
+    # so with it installed (as requirements.txt does) more names clear the bar.
+    SUGGESTION_MIN_SCORE = 0.35
+    SUGGESTION_CONTAINMENT_BONUS = 0.2
 
     @staticmethod
     def _validate_destination_coordinates(lat, lon):
-        return -90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0
+        return RouteOrchestratorView._is_valid_point(lat, lon)
 
     @staticmethod
     def _normalize_text(value):
         return str(value or "").strip().lower()
 
-    def _suggest_destination(self, destination_text):
-        normalized_text = self._normalize_text(destination_text)
-        if not normalized_text:
-            return None
-
-        candidates = (
+    @staticmethod
+    def _destination_candidates(normalized_text):
+        known = (
             RouteHistory.objects.exclude(destination_name__isnull=True)
             .exclude(destination_name="")
             .exclude(destination_lat__isnull=True)
             .exclude(destination_lon__isnull=True)
-            .values("destination_name", "destination_lat", "destination_lon")
-            .order_by("-created_at")[:300]
+            .annotate(name_norm=Lower(Trim("destination_name")))
         )
+        fields = ("destination_name", "name_norm", "destination_lat", "destination_lon")
+
+        if connection.vendor == "postgresql":
+            # The trigram index narrows the search to names that already look
+            # alike; the recent-destinations scan below only runs when the
+            # index finds nothing, e.g. for very short queries.
+            similar = list(
+                known.annotate(name_lower=Lower("destination_name"))
+                .filter(name_lower__trigram_similar=normalized_text)
+                .order_by(
+                    TrigramSimilarity("name_lower", normalized_text).desc(),
+                    "-created_at",
+                )
+                .values(*fields)[:50]
+            )
+            if similar:
+                return similar
+
+        recent = recent_destinations.get()
+        if recent is None:
+            recent = list(known.values(*fields).order_by("-created_at")[:300])
+            recent_destinations.put(recent)
+        return recent
+
+    def _suggest_destination(self, destination_text):
+        normalized_text = self._normalize_text(destination_text)
+        if not normalized_text:
+            return None
 
+        candidates = self._destination_candidates(normalized_text)
+
+        query_length = len(normalized_text)
         best = None
         best_score = 0.0
         for item in candidates:
-            candidate_name = item.get("destination_name")
-            candidate_text = self._normalize_text(candidate_name)
+            # name_norm is the database-side equivalent of _normalize_text.
+            candidate_text = item["name_norm"]
             if not candidate_text:
                 continue
-
-            score = SequenceMatcher(None, normalized_text, candidate_text).ratio()
+            if candidate_text == normalized_text:
+                # Nothing can outscore an exact match, so stop scanning.
+                best, best_score = item, 1.0
+                break
+
+            # Both similarity measures are bounded by 2 * shorter / total length,
+            # so names of very different length are skipped without scoring. The
+            # slack absorbs float rounding in the similarity ratios.
+            candidate_length = len(candidate_text)
+            bonus = 0.0
             if normalized_text in candidate_text or candidate_text in normalized_text:
-                score += 0.2
+                bonus = self.SUGGESTION_CONTAINMENT_BONUS
+            shorter = min(query_length, candidate_length)
+            score_bound = 2 * shorter / (query_length + candidate_length) + bonus + 1e-9
+            if score_bound <= best_score or score_bound < self.SUGGESTION_MIN_SCORE:
+                continue
 
+            score = _text_similarity(normalized_text, candidate_text) + bonus
             if score > best_score:
                 best_score = score
                 best = item
 
-        if best is None or best_score < 0.35:
+        if best is None or best_score < self.SUGGESTION_MIN_SCORE:
             return None
 
         return {
@@ -1101,101 +1511,55 @@ class RouteSearchView(RouteOrchestratorView):
             "lon": float(ai_result["to_lon"]),
             "intent": ai_result.get("intent", "standard"),
         }
+        destination_hints.put(
+            destination_text, (None, (destination["lat"], destination["lon"]))
+        )
         return destination
 
+    def _start_speculative_route(self, destination_text, current_location):
+        # Searches always route from the current location, whatever the hint says.
+        hint = destination_hints.get(destination_text)
+        if hint is None or self.routing_client is None:
+            return None
+        return SpeculativeRoute(self.routing_client, (*current_location, *hint[1]))
+
     def _route_from_confirmed_destination(
         self,
-        *,
-        request,
-        request_id,
-        destination_text,
+        history,
         current_location,
         destination,
-        route_filter,
         intent,
-        source_type,
+        speculative_route=None,
     ):
-        from_data = {
+        history.from_data = {
             "name": "current_location",
             "lat": current_location[0],
             "lon": current_location[1],
         }
-        to_data = {
+        history.to_data = {
             "name": destination.get("name"),
             "lat": destination["lat"],
             "lon": destination["lon"],
         }
 
         if self.routing_client is None:
+            self._discard_speculation(speculative_route)
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_503_SERVICE_UNAVAILABLE,
                 "SERVICE_CONFIGURATION_ERROR",
                 "Routing service client is not configured.",
             )
 
-        route_result = self.routing_client.get_route(
-            from_data["lat"],
-            from_data["lon"],
-            to_data["lat"],
-            to_data["lon"],
-        )
-        route_result, selected_route = self._select_route(route_result, route_filter)
-        if selected_route is None:
-            self._record_history(
-                request=request,
-                request_id=request_id,
-                source_type=source_type,
-                input_text=destination_text,
-                preference=route_filter,
-                from_data=from_data,
-                to_data=to_data,
-                route_result=route_result,
-                status_value=RouteHistory.STATUS_FAILED,
-                error_code="ROUTING_NO_MATCHING_FILTER",
-                error_message=f"No route found for filter '{route_filter}'.",
-                selected_route_type=None,
-                selected_route=None,
-                unresolved_reason="routing_no_matching_filter",
-                ai_latency_ms=None,
-                routing_latency_ms=None,
-                total_latency_ms=None,
-            )
-            return self._error_response(
-                request_id,
-                status.HTTP_404_NOT_FOUND,
-                "ROUTING_NO_MATCHING_FILTER",
-                f"No route found for filter '{route_filter}'.",
-            )
-
-        self._record_history(
-            request=request,
-            request_id=request_id,
-            source_type=source_type,
-            input_text=destination_text,
-            preference=route_filter,
-            from_data=from_data,
-            to_data=to_data,
-            route_result=route_result,
-            status_value=RouteHistory.STATUS_SUCCESS,
-            error_code=None,
-            error_message=None,
-            selected_route_type=(selected_route or {}).get("type"),
-            selected_route=selected_route,
-            unresolved_reason=None,
-            ai_latency_ms=None,
-            routing_latency_ms=None,
-            total_latency_ms=None,
-        )
-        return self._success_response(
-            request_id=request_id,
-            source="text" if source_type == RouteHistory.SOURCE_TEXT else "map",
-            route_result=route_result,
-            from_data=from_data,
-            to_data=to_data,
+        return self._route_and_respond(
+            history,
+            history.from_data["lat"],
+            history.from_data["lon"],
+            history.to_data["lat"],
+            history.to_data["lon"],
+            source="text" if history.source_type == RouteHistory.SOURCE_TEXT else "map",
             intent=intent,
-            route_filter=route_filter,
-            selected_route=selected_route,
+            speculative_route=speculative_route,
         )
 
     @extend_schema(
@@ -1236,6 +1600,7 @@ class RouteSearchView(RouteOrchestratorView):
                 required=False,
                 description="Optional fallback current longitude.",
             ),
+            ROUTE_INCLUDE_PARAMETER,
         ],
         responses={
             200: inline_serializer(
@@ -1266,21 +1631,22 @@ class RouteSearchView(RouteOrchestratorView):
         ],
     )
     def post(self, request):
-        request_id = str(uuid4())
+        history = RouteHistoryScope(self, request)
         data = request.data if isinstance(request.data, dict) else {}
 
-        if self.client_boot_error:
+        boot_error = self._boot_error(needs_ai=True)
+        if boot_error:
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_503_SERVICE_UNAVAILABLE,
                 "SERVICE_CONFIGURATION_ERROR",
-                self.client_boot_error,
+                boot_error,
             )
 
         destination_text = str(data.get("destination_text") or "").strip()
         if not destination_text:
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_400_BAD_REQUEST,
                 "DESTINATION_TEXT_REQUIRED",
                 "destination_text is required.",
@@ -1289,19 +1655,26 @@ class RouteSearchView(RouteOrchestratorView):
         current_location = self._parse_current_location(data, request.query_params)
         if current_location is None:
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_400_BAD_REQUEST,
                 "CURRENT_LOCATION_REQUIRED",
                 "Provide current_location or current_latitude/current_longitude.",
             )
 
         route_filter = self._parse_filter(data)
+        history.input_text = destination_text
+        history.preference = route_filter
+        speculative_route = self._start_speculative_route(
+            destination_text, current_location
+        )
 
         try:
-            destination = self._extract_destination(destination_text)
+            with history.timed("ai_latency_ns"):
+                destination = self._extract_destination(destination_text)
         except RuntimeError as error:
+            self._discard_speculation(speculative_route)
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_503_SERVICE_UNAVAILABLE,
                 "SERVICE_CONFIGURATION_ERROR",
                 str(error),
@@ -1315,38 +1688,28 @@ class RouteSearchView(RouteOrchestratorView):
             }:
                 destination = None
             else:
+                self._discard_speculation(speculative_route)
                 return self._error_response(
-                    request_id,
+                    history.request_id,
                     http_status,
                     error_code,
                     error.details,
                 )
 
         if destination is None:
+            self._discard_speculation(speculative_route)
             suggested = self._suggest_destination(destination_text)
             if suggested:
-                self._record_history(
-                    request=request,
-                    request_id=request_id,
-                    source_type=RouteHistory.SOURCE_TEXT,
-                    input_text=destination_text,
-                    preference=route_filter,
-                    from_data={
-                        "name": "current_location",
-                        "lat": current_location[0],
-                        "lon": current_location[1],
-                    },
-                    to_data=suggested,
-                    route_result=None,
-                    status_value=RouteHistory.STATUS_FAILED,
-                    error_code="DESTINATION_CONFIRMATION_REQUIRED",
-                    error_message="Closest destination suggestion returned.",
-                    selected_route_type=None,
-                    selected_route=None,
+                history.from_data = {
+                    "name": "current_location",
+                    "lat": current_location[0],
+                    "lon": current_location[1],
+                }
+                history.to_data = suggested
+                history.record_failure(
+                    "DESTINATION_CONFIRMATION_REQUIRED",
+                    "Closest destination suggestion returned.",
                     unresolved_reason="destination_confirmation_required",
-                    ai_latency_ms=None,
-                    routing_latency_ms=None,
-                    total_latency_ms=None,
                 )
                 return Response(
                     {
@@ -1362,21 +1725,18 @@ class RouteSearchView(RouteOrchestratorView):
                 )
 
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_404_NOT_FOUND,
                 "DESTINATION_NOT_FOUND",
                 "Destination not found from input text.",
             )
 
         return self._route_from_confirmed_destination(
-            request=request,
-            request_id=request_id,
-            destination_text=destination_text,
-            current_location=current_location,
-            destination=destination,
-            route_filter=route_filter,
+            history,
+            current_location,
+            destination,
             intent=destination.get("intent", "standard"),
-            source_type=RouteHistory.SOURCE_TEXT,
+            speculative_route=speculative_route,
         )
 
 
@@ -1408,6 +1768,7 @@ class RouteSearchConfirmView(RouteSearchView):
                 "filter": serializers.IntegerField(required=False, default=1),
             },
         ),
+        parameters=[ROUTE_INCLUDE_PARAMETER],
         responses={
             200: RouteSuccessResponseSerializer,
             400: OpenApiResponse(response=RouteErrorResponseSerializer),
@@ -1432,21 +1793,24 @@ class RouteSearchConfirmView(RouteSearchView):
         ],
     )
     def post(self, request):
-        request_id = str(uuid4())
+        history = RouteHistoryScope(
+            self, request, source_type=RouteHistory.SOURCE_MAP
+        )
         data = request.data if isinstance(request.data, dict) else {}
 
-        if self.client_boot_error:
+        boot_error = self._boot_error(needs_ai=False)
+        if boot_error:
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_503_SERVICE_UNAVAILABLE,
                 "SERVICE_CONFIGURATION_ERROR",
-                self.client_boot_error,
+                boot_error,
             )
 
         current_location = self._parse_current_location(data, request.query_params)
         if current_location is None:
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_400_BAD_REQUEST,
                 "CURRENT_LOCATION_REQUIRED",
                 "Provide current_location or current_latitude/current_longitude.",
@@ -1455,7 +1819,7 @@ class RouteSearchConfirmView(RouteSearchView):
         destination = data.get("destination")
         if not isinstance(destination, dict):
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_400_BAD_REQUEST,
                 "DESTINATION_REQUIRED",
                 "destination with lat/lon is required.",
@@ -1466,7 +1830,7 @@ class RouteSearchConfirmView(RouteSearchView):
             dest_lon = float(destination["lon"])
         except (TypeError, KeyError, ValueError):
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_400_BAD_REQUEST,
                 "INVALID_DESTINATION_COORDINATES",
                 "Destination coordinates are invalid.",
@@ -1474,22 +1838,19 @@ class RouteSearchConfirmView(RouteSearchView):
 
         if not self._validate_destination_coordinates(dest_lat, dest_lon):
             return self._error_response(
-                request_id,
+                history.request_id,
                 status.HTTP_400_BAD_REQUEST,
                 "INVALID_DESTINATION_COORDINATES",
                 "Destination coordinates are out of bounds.",
             )
 
-        route_filter = self._parse_filter(data)
         destination_name = str(destination.get("name") or "Destination")
+        history.input_text = destination_name
+        history.preference = self._parse_filter(data)
 
         return self._route_from_confirmed_destination(
-            request=request,
-            request_id=request_id,
-            destination_text=destination_name,
-            current_location=current_location,
-            destination={"name": destination_name, "lat": dest_lat, "lon": dest_lon},
-            route_filter=route_filter,
+            history,
+            current_location,
+            {"name": destination_name, "lat": dest_lat, "lon": dest_lon},
             intent="confirm_destination",
-            source_type=RouteHistory.SOURCE_MAP,
         )